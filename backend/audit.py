@@ -0,0 +1,234 @@
+"""Batched audit log writer for Campus Hub"""
+
+import atexit
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from flask import current_app
+from forksafe import PerProcessWorker
+from models import db, AuditLog
+
+
+class AuditWriter(PerProcessWorker):
+    """Queue audit entries in-process and insert them in bulk from a worker.
+
+    Entries recorded with durable=True are added to the caller's session
+    instead, so they commit (or roll back) together with the main change.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._counters = {
+            "queued": 0,
+            "written": 0,
+            "dropped": 0,
+            "failed": 0,
+            "flushes": 0,
+        }
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("AUDIT_ASYNC", True)
+        app.config.setdefault("AUDIT_BATCH_SIZE", 200)
+        app.config.setdefault("AUDIT_FLUSH_INTERVAL", 1.0)
+        app.config.setdefault("AUDIT_QUEUE_SIZE", 10000)
+        app.config.setdefault("AUDIT_RETENTION_DAYS", 90)
+        app.config.setdefault(
+            "AUDIT_ARCHIVE_DIR", os.path.join(app.instance_path, "audit-archive")
+        )
+
+        self.app = app
+        self.async_enabled = app.config["AUDIT_ASYNC"]
+        self.batch_size = app.config["AUDIT_BATCH_SIZE"]
+        self.flush_interval = app.config["AUDIT_FLUSH_INTERVAL"]
+        self._queue = queue.Queue(maxsize=app.config["AUDIT_QUEUE_SIZE"])
+
+        app.extensions["audit"] = self
+        atexit.register(self.close)
+
+    def record(self, user_id, action, durable=False):
+        """Record an audit entry.
+
+        Durable entries join the current db.session transaction and are
+        written by the caller's commit. Other entries are queued and
+        flushed in bulk by the background worker.
+        """
+        if durable:
+            db.session.add(AuditLog(user_id=user_id, action=action))
+            return
+
+        entry = {
+            "user_id": user_id,
+            "action": action,
+            "timestamp": datetime.utcnow(),
+        }
+        if not self.async_enabled:
+            self._write([entry])
+            return
+
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self._count("dropped")
+            return
+        self._count("queued")
+
+    def flush(self):
+        """Write every queued entry from the calling thread."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+
+    def close(self, timeout=5.0):
+        """Stop the worker and flush whatever is still queued."""
+        self._stop.set()
+        thread = self._detach_worker()
+        if thread is not None:
+            thread.join(timeout)
+        self.flush()
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._counters)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["async"] = self.async_enabled
+        return stats
+
+    def _start_worker(self):
+        if self._worker_pid is not None:
+            # Queue locks copied across fork are unusable in the child
+            self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._stop = threading.Event()
+        thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        thread.start()
+        return thread
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+
+            # Collect until the batch is full or the flush interval elapses
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch):
+        try:
+            with self.app.app_context():
+                with db.engine.begin() as connection:
+                    # A list of parameter sets runs as a single executemany
+                    connection.execute(AuditLog.__table__.insert(), batch)
+        except Exception:
+            self._count("failed", len(batch))
+            self.app.logger.exception(
+                "Failed to write %d audit entries", len(batch)
+            )
+            return
+        self._count("written", len(batch))
+        self._count("flushes")
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._counters[name] += amount
+
+
+def record_audit(user_id, action, durable=False):
+    """Record an audit entry through the current app's AuditWriter."""
+    current_app.extensions["audit"].record(user_id, action, durable=durable)
+
+
+# ============ RETENTION ============
+
+ARCHIVE_BATCH_SIZE = 5000
+
+
+def _append_archive(path, rows):
+    lines = "".join(
+        json.dumps(
+            {
+                "id": row.id,
+                "user_id": row.user_id,
+                "action": row.action,
+                "timestamp": row.timestamp.isoformat(),
+            },
+            separators=(",", ":"),
+        )
+        + "\n"
+        for row in rows
+    )
+    # Each append is its own gzip member; gzip readers concatenate them
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as compressed:
+            compressed.write(lines.encode())
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def archive_audit_log(
+    cutoff, archive_dir, batch_size=ARCHIVE_BATCH_SIZE, on_batch=None
+):
+    """Move audit rows older than `cutoff` into per-month gzip NDJSON files.
+
+    Rows go to audit-YYYY-MM.ndjson.gz in batches; each batch is synced to
+    disk before its rows are deleted, so an interrupted run can at worst
+    archive a batch twice, never lose it. Returns (archived, paths).
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    table = AuditLog.__table__
+    archived = 0
+    paths = set()
+
+    while True:
+        rows = db.session.execute(
+            db.select(table)
+            .where(table.c.timestamp < cutoff)
+            .order_by(table.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        by_month = defaultdict(list)
+        for row in rows:
+            by_month[row.timestamp.strftime("%Y-%m")].append(row)
+        for month, month_rows in sorted(by_month.items()):
+            path = os.path.join(archive_dir, f"audit-{month}.ndjson.gz")
+            _append_archive(path, month_rows)
+            paths.add(path)
+
+        db.session.execute(
+            table.delete().where(table.c.id.in_([row.id for row in rows]))
+        )
+        db.session.commit()
+        archived += len(rows)
+        if on_batch:
+            on_batch(archived)
+
+    return archived, sorted(paths)
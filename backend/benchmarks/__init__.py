@@ -0,0 +1,5 @@
+"""Benchmarks for the Campus Hub backend.
+
+Run modules from the backend directory, e.g. ``python -m benchmarks.bench_auth``
+or ``python -m benchmarks.run`` for the full load-test suite.
+"""
@@ -0,0 +1,58 @@
+"""Microbenchmark of per-request JWT authentication overhead.
+
+Compares authenticate_request() with a cold token cache (full PyJWT decode
+and HMAC verification on every call, as before the cache existed) against
+a warm cache.
+
+    python -m benchmarks.bench_auth --iterations 20000
+
+Both include the token revocation check, which runs on every request.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from jwt_auth import authenticate_request, create_access_token, token_cache
+
+
+def _time_per_call(app, token, iterations, warm):
+    headers = {"Authorization": f"Bearer {token}"}
+    with app.test_request_context(headers=headers):
+        token_cache.clear()
+        if warm:
+            authenticate_request()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            if not warm:
+                token_cache.clear()
+            authenticate_request()
+        elapsed = time.perf_counter() - start
+    return elapsed / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    # Config reads DATABASE_URL at import time; use a throwaway database
+    workdir = tempfile.mkdtemp(prefix="campus-hub-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+
+    from app import create_app
+
+    app = create_app("development")
+    token = create_access_token(1, "bench_user", "student")
+
+    cold = _time_per_call(app, token, args.iterations, warm=False)
+    warm = _time_per_call(app, token, args.iterations, warm=True)
+
+    print(f"iterations:            {args.iterations}")
+    print(f"uncached verification: {cold:8.2f} us/request")
+    print(f"cached verification:   {warm:8.2f} us/request")
+    print(f"speedup:               {cold / warm:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark of list serialization: ORM to_dict() against RowSchema rows.
+
+Builds N courses in a throwaway SQLite database and times three ways of
+turning them into a JSON body, with the rows already fetched
+(serialize) and including the query (end-to-end):
+
+- orm: Course objects with instructors joined-loaded, to_dict(), jsonify
+- rows+dict: listing rows converted to dicts field by field, jsonify
+- schema: listing rows through COURSE_SCHEMA and serializers.dumps
+
+    python -m benchmarks.bench_serialization --rows 10000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+
+def _best_of(repeat, fn):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="campus-hub-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+
+    from flask import jsonify
+    from app import create_app
+    from models import db, Course
+    from serializers import COURSE_SCHEMA, dumps, orjson
+    from benchmarks.dataset import build_dataset
+
+    app = create_app()
+    scale = {"students": 0, "teachers": 50, "courses": args.rows}
+    scale.update(enrollments=0, audit=0)
+
+    with app.app_context():
+        build_dataset(scale)
+
+        def orm_query():
+            return Course.query.options(db.joinedload(Course.instructor)).all()
+
+        def row_query():
+            return db.session.execute(COURSE_SCHEMA.select()).all()
+
+        def orm_body(courses):
+            return jsonify([course.to_dict() for course in courses]).get_data()
+
+        def dict_body(rows):
+            return jsonify(
+                [
+                    {
+                        "id": row.id,
+                        "title": row.title,
+                        "description": row.description,
+                        "instructor_id": row.instructor_id,
+                        "instructor": row.instructor,
+                        "credits": row.credits,
+                        "capacity": row.capacity,
+                        "enrolled_count": row.enrolled_count,
+                        "created_at": row.created_at.isoformat(),
+                        "updated_at": row.updated_at.isoformat(),
+                    }
+                    for row in rows
+                ]
+            ).get_data()
+
+        def schema_body(rows):
+            return dumps(COURSE_SCHEMA.to_dicts(rows))
+
+        courses = orm_query()
+        rows = row_query()
+        results = [
+            (
+                "orm",
+                _best_of(args.repeat, lambda: orm_body(courses)),
+                _best_of(args.repeat, lambda: orm_body(orm_query())),
+            ),
+            (
+                "rows+dict",
+                _best_of(args.repeat, lambda: dict_body(rows)),
+                _best_of(args.repeat, lambda: dict_body(row_query())),
+            ),
+            (
+                "schema",
+                _best_of(args.repeat, lambda: schema_body(rows)),
+                _best_of(args.repeat, lambda: schema_body(row_query())),
+            ),
+        ]
+        db.session.remove()
+
+    print(f"rows:     {args.rows}")
+    print(f"encoder:  {'orjson' if orjson else 'json (stdlib)'}")
+    print(f"{'path':12} {'serialize ms':>14} {'end-to-end ms':>14}")
+    for name, serialize, total in results:
+        print(f"{name:12} {serialize:14.1f} {total:14.1f}")
+
+
+if __name__ == "__main__":
+    main()
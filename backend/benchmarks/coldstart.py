@@ -0,0 +1,90 @@
+"""Measure how long a new worker takes to serve its first request.
+
+Each run is a fresh interpreter importing wsgi.py, the production entry
+point, against the current DATABASE_URL:
+
+    boot_ms                  import + create_app + mapper configuration
+    first_request_ms         first request in that process (no preload)
+    forked_first_request_ms  first request in a worker forked after the
+                             boot, as with gunicorn's preload_app
+
+Without preloading every worker pays boot_ms + first_request_ms; with it,
+the boot is paid once by the master.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+COLD_START_PATH = "/courses?limit=20"
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _first_request(app):
+    started = time.perf_counter()
+    response = app.test_client().get(COLD_START_PATH)
+    elapsed = time.perf_counter() - started
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {COLD_START_PATH} returned {response.status_code}")
+    return elapsed
+
+
+def _forked_first_request(app):
+    from models import db
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        started = time.perf_counter()
+        with app.app_context():
+            db.engine.dispose(close=False)  # as gunicorn.conf.py's post_fork
+        elapsed = time.perf_counter() - started + _first_request(app)
+        os.write(write_fd, repr(elapsed).encode())
+        os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        output = pipe.read()
+    os.waitpid(pid, 0)
+    return float(output)
+
+
+def _measure_once():
+    """Run inside the fresh interpreter; returns the timings in ms"""
+    started = time.perf_counter()
+    import wsgi
+
+    boot = time.perf_counter() - started
+    timings = {"boot_ms": boot}
+    if hasattr(os, "fork"):
+        timings["forked_first_request_ms"] = _forked_first_request(wsgi.app)
+    timings["first_request_ms"] = _first_request(wsgi.app)
+    return {name: round(seconds * 1000, 2) for name, seconds in timings.items()}
+
+
+def measure_cold_start(runs):
+    """Median cold-start timings over `runs` fresh interpreters"""
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-m", "benchmarks.coldstart"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        samples.append(json.loads(result.stdout.splitlines()[-1]))
+    report = {
+        name: round(statistics.median(sample[name] for sample in samples), 2)
+        for name in samples[0]
+    }
+    report["runs"] = runs
+    return report
+
+
+if __name__ == "__main__":
+    print(json.dumps(_measure_once()))
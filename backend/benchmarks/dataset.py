@@ -0,0 +1,196 @@
+"""Synthetic Campus Hub datasets for benchmarks.
+
+Rows are inserted through the model tables in executemany batches. Every
+generated user shares BENCH_PASSWORD so scenarios can log in as anyone;
+the hash is computed once, but logins still pay the full verification cost.
+"""
+
+import random
+from datetime import datetime, timedelta
+from werkzeug.security import generate_password_hash
+from models import db, User, Course, Enrollment, AuditLog, reconcile_enrolled_counts
+
+BENCH_PASSWORD = "benchpass"
+COURSE_DESCRIPTION_PREFIX = "Synthetic "
+INSERT_BATCH_SIZE = 5000
+
+SCALES = {
+    "small": {
+        "students": 200,
+        "teachers": 10,
+        "courses": 50,
+        "enrollments": 1000,
+        "audit": 5000,
+    },
+    "medium": {
+        "students": 2000,
+        "teachers": 50,
+        "courses": 500,
+        "enrollments": 10000,
+        "audit": 50000,
+    },
+    "large": {
+        "students": 20000,
+        "teachers": 200,
+        "courses": 2000,
+        "enrollments": 100000,
+        "audit": 500000,
+    },
+}
+
+SUBJECTS = (
+    "Algorithms",
+    "Biology",
+    "Calculus",
+    "Databases",
+    "Economics",
+    "Film Studies",
+    "Geometry",
+    "History",
+    "Networks",
+    "Physics",
+    "Statistics",
+    "Writing",
+)
+LEVELS = ("Introduction to", "Intermediate", "Advanced", "Topics in")
+
+
+def student_username(index):
+    return f"bench_student_{index}"
+
+
+def teacher_username(index):
+    return f"bench_teacher_{index}"
+
+
+def _insert(table, rows):
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        db.session.execute(table.insert(), rows[start : start + INSERT_BATCH_SIZE])
+
+
+def _user_ids(prefix):
+    return list(
+        db.session.execute(
+            db.select(User.id)
+            .where(User.username.like(f"{prefix}%"))
+            .order_by(User.id)
+        ).scalars()
+    )
+
+
+def _course_ids():
+    return list(
+        db.session.execute(
+            db.select(Course.id)
+            .where(Course.description.like(f"{COURSE_DESCRIPTION_PREFIX}%"))
+            .order_by(Course.id)
+        ).scalars()
+    )
+
+
+def build_dataset(scale, seed=0):
+    """Insert a synthetic dataset of the given scale and describe it.
+
+    `scale` is a dict with the keys of SCALES. Must run inside an app
+    context. Returns the ids the scenarios pick from.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    password_hash = generate_password_hash(BENCH_PASSWORD)
+
+    def user_row(username, role):
+        return {
+            "username": username,
+            "email": f"{username}@bench.campus.edu",
+            "password_hash": password_hash,
+            "role": role,
+            "full_name": username.replace("_", " ").title(),
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    _insert(
+        User.__table__,
+        [user_row(teacher_username(i), "teacher") for i in range(scale["teachers"])]
+        + [user_row(student_username(i), "student") for i in range(scale["students"])],
+    )
+    teacher_ids = _user_ids("bench_teacher_")
+    student_ids = _user_ids("bench_student_")
+
+    course_rows = []
+    for i in range(scale["courses"]):
+        level, subject = rng.choice(LEVELS), rng.choice(SUBJECTS)
+        course_rows.append(
+            {
+                "title": f"{level} {subject} {i}",
+                "description": f"{COURSE_DESCRIPTION_PREFIX}{subject.lower()} course",
+                "instructor_id": rng.choice(teacher_ids),
+                "credits": rng.randint(1, 5),
+                "capacity": rng.randint(20, 200),
+                "enrolled_count": 0,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+    _insert(Course.__table__, course_rows)
+    course_ids = _course_ids()
+    seats = {
+        course_id: row["capacity"] for course_id, row in zip(course_ids, course_rows)
+    }
+
+    # Unique (student, course) pairs that respect each course's capacity
+    pairs = set()
+    enrollment_rows = []
+    attempts = scale["enrollments"] * 3
+    while len(enrollment_rows) < scale["enrollments"] and attempts and seats:
+        attempts -= 1
+        pair = (rng.choice(student_ids), rng.choice(course_ids))
+        if pair in pairs or seats[pair[1]] <= 0:
+            continue
+        pairs.add(pair)
+        seats[pair[1]] -= 1
+        enrollment_rows.append(
+            {
+                "student_id": pair[0],
+                "course_id": pair[1],
+                "status": "enrolled",
+                "created_at": now - timedelta(minutes=len(enrollment_rows)),
+                "updated_at": now,
+            }
+        )
+    _insert(Enrollment.__table__, enrollment_rows)
+
+    user_ids = teacher_ids + student_ids
+    _insert(
+        AuditLog.__table__,
+        [
+            {
+                "user_id": rng.choice(user_ids),
+                "action": rng.choice(("User logged in", "Updated profile")),
+                "timestamp": now - timedelta(seconds=i),
+            }
+            for i in range(scale["audit"] if user_ids else 0)
+        ],
+    )
+    db.session.commit()
+    reconcile_enrolled_counts()
+
+    return describe_dataset()
+
+
+def describe_dataset():
+    """Recover the dataset description from a database built earlier."""
+    students = {
+        user_id: username
+        for user_id, username in db.session.execute(
+            db.select(User.id, User.username)
+            .where(User.username.like("bench_student_%"))
+            .order_by(User.id)
+        )
+    }
+    return {
+        "student_ids": list(students),
+        "teacher_ids": _user_ids("bench_teacher_"),
+        "course_ids": _course_ids(),
+        "students": students,
+    }
@@ -0,0 +1,226 @@
+"""Request drivers, measurement and baseline comparison for benchmarks"""
+
+import json
+import math
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.cookies import SimpleCookie
+from sqlalchemy import event
+
+STATEMENT_TOLERANCE = 0.05
+# Runs are only comparable when these settings match
+COMPARABLE_SETTINGS = (
+    "scale",
+    "requests",
+    "concurrency",
+    "seed",
+    "mode",
+    "scenarios",
+    "rate_limits",
+)
+
+
+class InProcessClient:
+    """Drives the Flask app through its test client (no network, no server)."""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def _client(self):
+        # One test client per thread keeps cookie jars independent
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client(use_cookies=False)
+        return client
+
+    def request(self, method, path, json_body=None, headers=None):
+        response = self._client().open(
+            path, method=method, json=json_body, headers=headers or {}
+        )
+        return response.status_code, response.headers.getlist("Set-Cookie")
+
+
+class HttpClient:
+    """Drives a running server over HTTP with urllib."""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def request(self, method, path, json_body=None, headers=None):
+        headers = dict(headers or {})
+        data = None
+        if json_body is not None:
+            data = json.dumps(json_body).encode()
+            headers["Content-Type"] = "application/json"
+        req = urllib.request.Request(
+            self.base_url + path, data=data, headers=headers, method=method
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                response.read()
+                return response.status, response.headers.get_all("Set-Cookie") or []
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code, e.headers.get_all("Set-Cookie") or []
+
+
+def cookie_value(set_cookie_headers, name):
+    for header in set_cookie_headers:
+        cookie = SimpleCookie(header)
+        if name in cookie:
+            return cookie[name].value
+    return None
+
+
+class StatementCounter:
+    """Counts SQL statements executed by the current thread.
+
+    Statements from other threads, such as the audit writer, are ignored so
+    the count belongs to the request being measured.
+    """
+
+    def __init__(self, engine):
+        self._local = threading.local()
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        if getattr(self._local, "count", None) is not None:
+            self._local.count += 1
+
+    def start(self):
+        self._local.count = 0
+
+    def stop(self):
+        count, self._local.count = self._local.count, None
+        return count
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples, elapsed):
+    """Reduce (label, status, seconds, statements) samples to a report"""
+
+    def reduce(group):
+        latencies = sorted(seconds * 1000 for _, _, seconds, _ in group)
+        statements = [count for _, _, _, count in group if count is not None]
+        return {
+            "requests": len(group),
+            "errors": sum(1 for _, status, _, _ in group if status >= 500),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "statements_per_request": (
+                round(sum(statements) / len(statements), 2) if statements else None
+            ),
+        }
+
+    report = reduce(samples)
+    report["throughput_rps"] = round(len(samples) / elapsed, 1) if elapsed else None
+    labels = sorted({label for label, _, _, _ in samples})
+    report["operations"] = {
+        label: reduce([s for s in samples if s[0] == label]) for label in labels
+    }
+    return report
+
+
+def run_scenario(client, steps, counter=None, concurrency=1):
+    """Execute (label, method, path, json_body, headers) steps and summarize.
+
+    With concurrency > 1 the steps are shared by that many threads.
+    """
+    samples = []
+    lock = threading.Lock()
+    iterator = iter(steps)
+
+    def worker():
+        while True:
+            with lock:
+                step = next(iterator, None)
+            if step is None:
+                return
+            label, method, path, json_body, headers = step
+            if counter:
+                counter.start()
+            start = time.perf_counter()
+            status, _ = client.request(method, path, json_body, headers)
+            seconds = time.perf_counter() - start
+            statements = counter.stop() if counter else None
+            with lock:
+                samples.append((label, status, seconds, statements))
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(samples, time.perf_counter() - started)
+
+
+def compare(baseline, current, tolerance):
+    """Return regressions of `current` against `baseline` as messages.
+
+    Latency and throughput may move by `tolerance` (a fraction) before they
+    count. Statements per request only vary with cache expiry, so they get
+    the much smaller STATEMENT_TOLERANCE.
+    """
+    regressions = []
+    for key in COMPARABLE_SETTINGS:
+        if baseline["meta"].get(key) != current["meta"].get(key):
+            regressions.append(
+                f"baseline was recorded with {key}={baseline['meta'].get(key)}, "
+                f"this run used {current['meta'].get(key)}"
+            )
+    if regressions:
+        return regressions
+
+    for name, before in baseline["scenarios"].items():
+        after = current["scenarios"].get(name)
+        if after is None:
+            continue
+
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            limit = before[metric] * (1 + tolerance)
+            if after[metric] > limit:
+                regressions.append(
+                    f"{name}: {metric} {after[metric]} > {round(limit, 3)} "
+                    f"(baseline {before[metric]})"
+                )
+
+        if before["throughput_rps"] and after["throughput_rps"]:
+            floor = before["throughput_rps"] / (1 + tolerance)
+            if after["throughput_rps"] < floor:
+                regressions.append(
+                    f"{name}: throughput_rps {after['throughput_rps']} < "
+                    f"{round(floor, 1)} (baseline {before['throughput_rps']})"
+                )
+
+        if after["errors"] > before["errors"]:
+            regressions.append(
+                f"{name}: errors {after['errors']} (baseline {before['errors']})"
+            )
+
+        for label, op_before in before["operations"].items():
+            op_after = after["operations"].get(label)
+            if not op_after or op_before["statements_per_request"] is None:
+                continue
+            if op_after["statements_per_request"] is None:
+                continue
+            limit = op_before["statements_per_request"] * (1 + STATEMENT_TOLERANCE)
+            if op_after["statements_per_request"] > limit:
+                regressions.append(
+                    f"{name}/{label}: statements_per_request "
+                    f"{op_after['statements_per_request']} "
+                    f"(baseline {op_before['statements_per_request']})"
+                )
+    return regressions
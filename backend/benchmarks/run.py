@@ -0,0 +1,206 @@
+"""Load-test the Campus Hub API with realistic request mixes.
+
+In-process (default): builds a synthetic dataset in a throwaway SQLite
+database and drives the app through the Flask test client, counting SQL
+statements per request.
+
+    python -m benchmarks.run --scale small --requests 500
+    python -m benchmarks.run --save-baseline benchmarks/baselines/small.json
+    python -m benchmarks.run --compare benchmarks/baselines/small.json
+
+Against a running server: build the dataset into the server's database
+first, then point the runner at it with the same DATABASE_URL (statement
+counts are not available over HTTP).
+
+    DATABASE_URL=sqlite:////tmp/bench.db python -m benchmarks.run --prepare-only
+    DATABASE_URL=sqlite:////tmp/bench.db python -m benchmarks.run \\
+        --base-url http://127.0.0.1:5000
+
+Each run also reports worker cold-start times (see benchmarks.coldstart);
+they are informational and not compared against baselines.
+
+A comparison run exits with status 1 when any scenario regresses.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from benchmarks.dataset import SCALES
+from benchmarks.scenarios import SCENARIOS
+
+DEFAULT_TOLERANCE = 0.25
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="\n".join(__doc__.splitlines()[1:]),
+    )
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="scenario to run (repeatable, default: all)",
+    )
+    parser.add_argument("--requests", type=int, default=500, help="per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="per scenario")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--config", default="development")
+    parser.add_argument("--base-url", help="benchmark a running server instead")
+    parser.add_argument(
+        "--rate-limits",
+        action="store_true",
+        help="keep rate limits on (off by default: all requests share one client)",
+    )
+    parser.add_argument(
+        "--prepare-only",
+        action="store_true",
+        help="build the dataset into DATABASE_URL and exit",
+    )
+    parser.add_argument(
+        "--cold-starts",
+        type=int,
+        default=3,
+        help="fresh processes to time for cold start (0 to skip)",
+    )
+    parser.add_argument("--output", help="write the results JSON here")
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH", help="baseline to compare")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    return parser.parse_args()
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def _print_report(name, report):
+    statements = report["statements_per_request"]
+    print(
+        f"{name:20} {report['requests']:6d} req  "
+        f"{report['throughput_rps'] or 0:8.1f} req/s  "
+        f"p50 {report['p50_ms']:8.2f} ms  p95 {report['p95_ms']:8.2f} ms  "
+        f"p99 {report['p99_ms']:8.2f} ms  "
+        f"sql/req {'-' if statements is None else statements}  "
+        f"errors {report['errors']}"
+    )
+    for label, op in report["operations"].items():
+        statements = op["statements_per_request"]
+        print(
+            f"  {label:18} {op['requests']:6d} req  {'':14}"
+            f"p50 {op['p50_ms']:8.2f} ms  p95 {op['p95_ms']:8.2f} ms  "
+            f"p99 {op['p99_ms']:8.2f} ms  "
+            f"sql/req {'-' if statements is None else statements}"
+        )
+
+
+def _print_cold_start(cold_start):
+    line = (
+        f"{'cold_start':20} {cold_start['runs']:6d} run  "
+        f"boot {cold_start['boot_ms']:8.2f} ms  "
+        f"first request {cold_start['first_request_ms']:8.2f} ms"
+    )
+    if "forked_first_request_ms" in cold_start:
+        forked = cold_start["forked_first_request_ms"]
+        line += f"  forked first request {forked:8.2f} ms"
+    print(line)
+
+
+def main():
+    args = _parse_args()
+
+    # Config reads DATABASE_URL at import time, so pick the database first
+    if not args.base_url and not args.prepare_only:
+        workdir = tempfile.mkdtemp(prefix="campus-hub-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+
+    # Every in-process request comes from the same address and user pool
+    if not args.rate_limits:
+        os.environ["RATE_LIMIT_ENABLED"] = "0"
+
+    from app import create_app
+    from models import db
+    from benchmarks.coldstart import measure_cold_start
+    from benchmarks.dataset import build_dataset, describe_dataset
+    from benchmarks.harness import (
+        HttpClient,
+        InProcessClient,
+        StatementCounter,
+        compare,
+        run_scenario,
+    )
+    from benchmarks.scenarios import ScenarioContext
+
+    app = create_app(args.config)
+    with app.app_context():
+        if args.base_url:
+            dataset = describe_dataset()
+            if not dataset["student_ids"]:
+                sys.exit("No benchmark dataset found; run with --prepare-only first")
+        else:
+            dataset = build_dataset(SCALES[args.scale], seed=args.seed)
+        if args.prepare_only:
+            print(f"Built {args.scale} dataset in {db.engine.url}")
+            return
+        counter = None if args.base_url else StatementCounter(db.engine)
+
+    client = HttpClient(args.base_url) if args.base_url else InProcessClient(app)
+    ctx = ScenarioContext(client, dataset, args.seed)
+    scenarios = args.scenario or list(SCENARIOS)
+
+    results = {
+        "meta": {
+            "scale": args.scale,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "scenarios": scenarios,
+            "mode": "http" if args.base_url else "in-process",
+            "rate_limits": args.rate_limits,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "scenarios": {},
+    }
+    for name in scenarios:
+        scenario = SCENARIOS[name]
+        ctx.reseed(name)
+        run_scenario(client, scenario(ctx, args.warmup))
+        steps = scenario(ctx, args.requests)
+        report = run_scenario(client, steps, counter, args.concurrency)
+        results["scenarios"][name] = report
+        _print_report(name, report)
+
+    if args.cold_starts:
+        cold_start = measure_cold_start(args.cold_starts)
+        results["cold_start"] = cold_start
+        _print_cold_start(cold_start)
+
+    if args.output:
+        _write_json(args.output, results)
+    if args.save_baseline:
+        _write_json(args.save_baseline, results)
+        print(f"Saved baseline to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, results, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Request mixes replayed by the benchmark runner.
+
+A scenario is a function (ctx, count) returning `count` steps of
+(label, method, path, json_body, headers). Steps are generated before the
+clock starts, so only the requests themselves are timed.
+"""
+
+import random
+from urllib.parse import quote
+from benchmarks.dataset import BENCH_PASSWORD, LEVELS, SUBJECTS
+from benchmarks.harness import cookie_value
+from jwt_auth import create_refresh_token
+from pagination import encode_cursor
+
+# Students logged in up front for scenarios that need a token
+SESSION_POOL_SIZE = 50
+
+
+def _credentials(username):
+    return {"username": username, "password": BENCH_PASSWORD}
+
+
+class ScenarioContext:
+    def __init__(self, client, dataset, seed=0):
+        self.client = client
+        self.dataset = dataset
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self._sessions = None
+
+    def reseed(self, name):
+        """Give each scenario its own random stream, whichever others run"""
+        self.rng = random.Random(f"{self.seed}:{name}")
+
+    def sessions(self):
+        """(student_id, auth headers) pairs for a pool of logged-in students"""
+        if self._sessions is None:
+            student_ids = self.dataset["student_ids"]
+            rng = random.Random(self.seed)
+            pool = rng.sample(student_ids, min(SESSION_POOL_SIZE, len(student_ids)))
+            self._sessions = []
+            for student_id in pool:
+                username = self.dataset["students"][student_id]
+                status, cookies = self.client.request(
+                    "POST", "/auth/login", _credentials(username)
+                )
+                token = cookie_value(cookies, "access_token")
+                if status != 200 or not token:
+                    raise RuntimeError(f"Login failed for student {student_id}")
+                headers = {"Authorization": f"Bearer {token}"}
+                self._sessions.append((student_id, headers))
+        return self._sessions
+
+    def weighted(self, choices, count):
+        """Pick `count` step builders from (weight, builder) pairs"""
+        weights = [weight for weight, _ in choices]
+        builders = [builder for _, builder in choices]
+        return [
+            builder() for builder in self.rng.choices(builders, weights, k=count)
+        ]
+
+
+def login_storm(ctx, count):
+    """Many students logging in at once; one in ten mistypes the password."""
+    students = ctx.dataset["students"]
+    student_ids = ctx.dataset["student_ids"]
+
+    def login():
+        username = students[ctx.rng.choice(student_ids)]
+        return ("login", "POST", "/auth/login", _credentials(username), None)
+
+    def bad_login():
+        username = students[ctx.rng.choice(student_ids)]
+        body = {"username": username, "password": "wrong-password"}
+        return ("login_failed", "POST", "/auth/login", body, None)
+
+    return ctx.weighted([(9, login), (1, bad_login)], count)
+
+
+def session_refresh(ctx, count):
+    """Returning students renewing their session with a refresh token.
+
+    The counterpart to login_storm: each step exchanges a distinct, unused
+    refresh token, minted up front (the server must share JWT_SECRET_KEY).
+    """
+    student_ids = ctx.dataset["student_ids"]
+
+    def refresh():
+        token = create_refresh_token(ctx.rng.choice(student_ids))
+        headers = {"Cookie": f"refresh_token={token}"}
+        return ("refresh", "POST", "/auth/refresh", None, headers)
+
+    return [refresh() for _ in range(count)]
+
+
+def catalogue_browsing(ctx, count):
+    """Anonymous visitors paging, filtering and opening courses."""
+    course_ids = ctx.dataset["course_ids"]
+
+    def first_page():
+        return ("list_page", "GET", "/courses?limit=20", None, None)
+
+    def later_page():
+        cursor = encode_cursor(ctx.rng.choice(course_ids))
+        path = f"/courses?limit=20&cursor={cursor}"
+        return ("list_page", "GET", path, None, None)
+
+    def title_filter():
+        prefix = ctx.rng.choice(LEVELS).split()[0]
+        return ("list_filtered", "GET", f"/courses?title_prefix={prefix}", None, None)
+
+    def detail():
+        path = f"/courses/{ctx.rng.choice(course_ids)}"
+        return ("course_detail", "GET", path, None, None)
+
+    return ctx.weighted(
+        [(3, first_page), (3, later_page), (1, title_filter), (3, detail)], count
+    )
+
+
+def course_search(ctx, count):
+    """Search-box traffic: whole words, typed prefixes and instructor filters."""
+    teacher_ids = ctx.dataset["teacher_ids"]
+
+    def words():
+        subject = ctx.rng.choice(SUBJECTS)
+        level = ctx.rng.choice(LEVELS).split()[0]
+        return quote(f"{level} {subject}")
+
+    def word():
+        query = quote(ctx.rng.choice(SUBJECTS).split()[0])
+        return ("search_word", "GET", f"/courses/search?q={query}", None, None)
+
+    def typed_prefix():
+        subject = ctx.rng.choice(SUBJECTS)
+        query = quote(subject[: ctx.rng.randint(2, 4)])
+        return ("search_prefix", "GET", f"/courses/search?q={query}", None, None)
+
+    def phrase():
+        return ("search_words", "GET", f"/courses/search?q={words()}", None, None)
+
+    def by_instructor():
+        instructor_id = ctx.rng.choice(teacher_ids)
+        path = f"/courses/search?q={words()}&instructor_id={instructor_id}"
+        return ("search_instructor", "GET", path, None, None)
+
+    return ctx.weighted(
+        [(3, word), (3, typed_prefix), (2, phrase), (1, by_instructor)], count
+    )
+
+
+def enrollment_rush(ctx, count):
+    """Registration opens: logged-in students compete for a few courses."""
+    sessions = ctx.sessions()
+    hot_courses = ctx.rng.sample(
+        ctx.dataset["course_ids"], min(5, len(ctx.dataset["course_ids"]))
+    )
+
+    def enroll():
+        _, headers = ctx.rng.choice(sessions)
+        body = {"course_id": ctx.rng.choice(hot_courses)}
+        return ("enroll", "POST", "/enrollments", body, headers)
+
+    def my_enrollments():
+        _, headers = ctx.rng.choice(sessions)
+        return ("my_enrollments", "GET", "/enrollments/my-enrollments", None, headers)
+
+    def course_detail():
+        path = f"/courses/{ctx.rng.choice(hot_courses)}"
+        return ("course_detail", "GET", path, None, None)
+
+    return ctx.weighted(
+        [(6, enroll), (2, my_enrollments), (2, course_detail)], count
+    )
+
+
+def profile_edits(ctx, count):
+    """Students reading and updating their own profiles."""
+    sessions = ctx.sessions()
+
+    def update():
+        student_id, headers = ctx.rng.choice(sessions)
+        body = {"bio": f"Benchmark bio {ctx.rng.random():.6f}", "city": "Lahore"}
+        path = f"/users/profile/{student_id}"
+        return ("update_profile", "PUT", path, body, headers)
+
+    def read():
+        student_id, headers = ctx.rng.choice(sessions)
+        path = f"/users/profile/{student_id}"
+        return ("get_profile", "GET", path, None, headers)
+
+    def me():
+        _, headers = ctx.rng.choice(sessions)
+        return ("me", "GET", "/auth/me", None, headers)
+
+    return ctx.weighted([(4, update), (4, read), (2, me)], count)
+
+
+SCENARIOS = {
+    "login_storm": login_storm,
+    "session_refresh": session_refresh,
+    "catalogue_browsing": catalogue_browsing,
+    "course_search": course_search,
+    "enrollment_rush": enrollment_rush,
+    "profile_edits": profile_edits,
+}
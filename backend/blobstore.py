@@ -0,0 +1,134 @@
+"""Content-addressed filesystem store for uploaded images"""
+
+import base64
+import hashlib
+import os
+import re
+import tempfile
+from flask import current_app
+
+CHUNK_SIZE = 64 * 1024
+DIGEST_PATTERN = re.compile(r"[0-9a-f]{64}")
+MEDIA_URL_PREFIX = "/media/"
+
+# Magic numbers of the image formats accepted for profile pictures
+IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+class BlobTooLarge(ValueError):
+    pass
+
+
+def sniff_image_type(header: bytes):
+    """Return the image MIME type for the leading bytes of a file, or None"""
+    for signature, mimetype in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return mimetype
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def decode_data_url(value: str):
+    """Decode a `data:<mime>;base64,<payload>` URL or bare base64 string"""
+    if value.startswith("data:"):
+        header, _, value = value.partition(",")
+        if not header.endswith(";base64"):
+            raise ValueError("Only base64 data URLs are supported")
+    return base64.b64decode(value, validate=True)
+
+
+class BlobStore:
+    """Store blobs on disk under the SHA-256 digest of their content.
+
+    Identical uploads map to the same file, so they are stored once.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._tmp = os.path.join(root, "tmp")
+        os.makedirs(self._tmp, exist_ok=True)
+
+    def path(self, digest: str):
+        # Fan out into two directory levels to keep directories small
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest: str):
+        return bool(DIGEST_PATTERN.fullmatch(digest)) and os.path.exists(
+            self.path(digest)
+        )
+
+    def put_stream(self, stream, max_bytes=None, require_image=False):
+        """Copy a file-like object into the store and return its digest.
+
+        The content is hashed while it is written to a temporary file, so
+        uploads are never held in memory in full.
+        """
+        hasher = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self._tmp)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    if require_image and size == 0 and not sniff_image_type(chunk):
+                        raise ValueError("Unsupported image type")
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise BlobTooLarge(f"Upload exceeds {max_bytes} bytes")
+                    hasher.update(chunk)
+                    tmp.write(chunk)
+
+            digest = hasher.hexdigest()
+            final_path = self.path(digest)
+            if os.path.exists(final_path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                os.replace(tmp_path, final_path)
+            return digest
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def put_bytes(self, data: bytes, max_bytes=None, require_image=False):
+        if max_bytes is not None and len(data) > max_bytes:
+            raise BlobTooLarge(f"Upload exceeds {max_bytes} bytes")
+        if require_image and not sniff_image_type(data[:16]):
+            raise ValueError("Unsupported image type")
+        digest = hashlib.sha256(data).hexdigest()
+        final_path = self.path(digest)
+        if not os.path.exists(final_path):
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._tmp)
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmp_path, final_path)
+        return digest
+
+    def content_type(self, digest: str):
+        with open(self.path(digest), "rb") as f:
+            return sniff_image_type(f.read(16)) or "application/octet-stream"
+
+
+def media_url(digest: str):
+    """Reference stored in the users row for a blob"""
+    return MEDIA_URL_PREFIX + digest
+
+
+def init_blobstore(app):
+    app.config.setdefault("MEDIA_ROOT", os.path.join(app.instance_path, "media"))
+    app.config.setdefault("PROFILE_PICTURE_MAX_BYTES", 5 * 1024 * 1024)
+    app.extensions["blobstore"] = BlobStore(app.config["MEDIA_ROOT"])
+
+
+def get_blobstore():
+    return current_app.extensions["blobstore"]
@@ -0,0 +1,416 @@
+"""Bulk import helpers for registrar and admin workflows"""
+
+import csv
+import io
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from sqlalchemy import bindparam
+from sqlalchemy.exc import IntegrityError
+from flask import current_app
+from events import publish_seats
+from passwords import hash_function
+from models import db, User, Course, Enrollment
+
+DEFAULT_CHUNK_SIZE = 1000
+USER_ROLES = ("student", "teacher", "admin")
+
+
+def detect_format(filename=None, mimetype=None, explicit=None):
+    """Pick "csv" or "ndjson" from an explicit value, file name or MIME type"""
+    if explicit:
+        fmt = explicit.lower()
+    elif filename and filename.lower().endswith((".ndjson", ".jsonl")):
+        fmt = "ndjson"
+    elif mimetype in ("application/x-ndjson", "application/jsonl"):
+        fmt = "ndjson"
+    else:
+        fmt = "csv"
+    if fmt not in ("csv", "ndjson"):
+        raise ValueError("format must be csv or ndjson")
+    return fmt
+
+
+def iter_records(stream, fmt):
+    """Yield (row_number, record) from a binary CSV or NDJSON stream.
+
+    Malformed NDJSON lines are yielded as (row_number, None) so they show
+    up in the result report instead of aborting the import.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    if fmt == "csv":
+        for row_number, record in enumerate(csv.DictReader(text), start=1):
+            yield row_number, record
+        return
+
+    row_number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield row_number, record if isinstance(record, dict) else None
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _error(row_number, message):
+    return {"row": row_number, "status": "error", "error": message}
+
+
+def _parse_enrollment(record):
+    """Return (student_key, course_id) or raise ValueError"""
+    if record is None:
+        raise ValueError("Malformed row")
+
+    student = record.get("student_id") or record.get("student")
+    student = student or record.get("username")
+    course = record.get("course_id") or record.get("course")
+    if student in (None, "") or course in (None, ""):
+        raise ValueError("Missing student or course_id")
+
+    try:
+        course_id = int(course)
+    except (TypeError, ValueError):
+        raise ValueError("course_id must be an integer")
+
+    # Numeric values are user ids, anything else is a username
+    student = str(student).strip()
+    return (int(student) if student.isdigit() else student), course_id
+
+
+def _resolve_students(keys):
+    ids = {key for key in keys if isinstance(key, int)}
+    names = {key for key in keys if isinstance(key, str)}
+    conditions = []
+    if ids:
+        conditions.append(User.id.in_(ids))
+    if names:
+        conditions.append(User.username.in_(names))
+    if not conditions:
+        return {}
+
+    resolved = {}
+    for user_id, username in db.session.execute(
+        db.select(User.id, User.username).where(db.or_(*conditions))
+    ):
+        resolved[user_id] = user_id
+        resolved[username] = user_id
+    return resolved
+
+
+def _enroll_chunk(rows, results):
+    """Validate and insert one chunk of (row_number, record) pairs"""
+    parsed = []
+    for row_number, record in rows:
+        try:
+            parsed.append((row_number, *_parse_enrollment(record)))
+        except ValueError as e:
+            results.append(_error(row_number, str(e)))
+
+    students = _resolve_students({student for _, student, _ in parsed})
+    course_ids = {course_id for _, _, course_id in parsed}
+    courses = {
+        course_id: capacity - enrolled_count
+        for course_id, capacity, enrolled_count in db.session.execute(
+            db.select(Course.id, Course.capacity, Course.enrolled_count).where(
+                Course.id.in_(course_ids)
+            )
+        )
+    }
+    student_ids = set(students.values())
+    existing = set(
+        db.session.execute(
+            db.select(Enrollment.student_id, Enrollment.course_id).where(
+                Enrollment.student_id.in_(student_ids),
+                Enrollment.course_id.in_(course_ids),
+            )
+        ).tuples()
+    )
+
+    accepted = []
+    seats_taken = {}
+    for row_number, student, course_id in parsed:
+        student_id = students.get(student)
+        if student_id is None:
+            error = "Student not found"
+        elif course_id not in courses:
+            error = "Course not found"
+        elif (student_id, course_id) in existing:
+            error = "Already enrolled in this course"
+        elif courses[course_id] <= 0:
+            error = "Course is at capacity"
+        else:
+            error = None
+
+        if error:
+            results.append(_error(row_number, error))
+            continue
+
+        courses[course_id] -= 1
+        existing.add((student_id, course_id))
+        seats_taken[course_id] = seats_taken.get(course_id, 0) + 1
+        accepted.append((row_number, student_id, course_id))
+
+    if not accepted:
+        return []
+
+    # Reserve the seats with the same guard as single enrollments; a course
+    # that filled up since it was read rejects its whole share of the chunk
+    courses_table = Course.__table__
+    reserve = (
+        courses_table.update()
+        .where(
+            courses_table.c.id == bindparam("b_id"),
+            courses_table.c.enrolled_count + bindparam("b_seats")
+            <= courses_table.c.capacity,
+        )
+        .values(
+            enrolled_count=courses_table.c.enrolled_count + bindparam("b_seats")
+        )
+    )
+    full = set()
+    for course_id, seats in seats_taken.items():
+        params = {"b_id": course_id, "b_seats": seats}
+        if not db.session.execute(reserve, params).rowcount:
+            full.add(course_id)
+
+    inserts = []
+    for row_number, student_id, course_id in accepted:
+        if course_id in full:
+            results.append(_error(row_number, "Course is at capacity"))
+        else:
+            inserts.append((row_number, student_id, course_id))
+
+    try:
+        if inserts:
+            db.session.execute(
+                Enrollment.__table__.insert(),
+                [
+                    {
+                        "student_id": student_id,
+                        "course_id": course_id,
+                        "status": "enrolled",
+                    }
+                    for _, student_id, course_id in inserts
+                ],
+            )
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent request enrolled one of these pairs; nothing was kept
+        db.session.rollback()
+        for row_number, _, _ in inserts:
+            results.append(_error(row_number, "Conflict, retry row"))
+        return []
+
+    for row_number, student_id, course_id in inserts:
+        results.append(
+            {
+                "row": row_number,
+                "status": "enrolled",
+                "student_id": student_id,
+                "course_id": course_id,
+            }
+        )
+    return [course_id for _, _, course_id in inserts]
+
+
+def bulk_enroll(records, chunk_size=DEFAULT_CHUNK_SIZE, on_chunk=None):
+    """Enroll (row_number, record) pairs in chunked transactions.
+
+    Each chunk is validated with set-based queries, capacity is enforced
+    per course in one pass and the chunk is committed on its own. Returns
+    a report with per-row results ordered by row number.
+
+    Rows take free seats directly and never look at the waitlist, so an
+    imported row can get a seat ahead of students already waiting for it.
+    """
+    results = []
+    for chunk in _chunks(records, chunk_size):
+        touched = _enroll_chunk(chunk, results)
+        if on_chunk:
+            on_chunk(set(touched), len(results))
+
+    results.sort(key=lambda result: result["row"])
+    enrolled = sum(1 for result in results if result["status"] == "enrolled")
+    return {
+        "total": len(results),
+        "enrolled": enrolled,
+        "failed": len(results) - enrolled,
+        "results": results,
+    }
+
+
+def publish_seat_counts(course_ids):
+    """Publish the committed seat counts of courses touched by an import"""
+    rows = db.session.execute(
+        db.select(Course.id, Course.enrolled_count, Course.capacity).where(
+            Course.id.in_(course_ids)
+        )
+    )
+    for course_id, enrolled_count, capacity in rows:
+        publish_seats(course_id, enrolled_count, capacity)
+
+
+def _parse_user(record):
+    """Return the users-table values for a roster record or raise ValueError"""
+    if record is None:
+        raise ValueError("Malformed row")
+
+    username = (record.get("username") or "").strip()
+    email = (record.get("email") or "").strip()
+    password = record.get("password") or ""
+    if not username or not email or not password:
+        raise ValueError("Missing required fields")
+
+    role = (record.get("role") or "student").strip()
+    if role not in USER_ROLES:
+        raise ValueError(f"Invalid role: {role}")
+
+    return {
+        "username": username,
+        "email": email,
+        "password": password,
+        "role": role,
+        "full_name": record.get("full_name") or None,
+    }
+
+
+def _create_user_chunk(rows, results, hash_map, seen_usernames, seen_emails):
+    """Validate, hash and insert one chunk of roster records"""
+    parsed = []
+    for row_number, record in rows:
+        try:
+            parsed.append((row_number, _parse_user(record)))
+        except ValueError as e:
+            results.append(_error(row_number, str(e)))
+
+    # Two IN queries per chunk instead of two lookups per user
+    usernames = {user["username"] for _, user in parsed}
+    emails = {user["email"] for _, user in parsed}
+    taken_usernames = set(
+        db.session.execute(
+            db.select(User.username).where(User.username.in_(usernames))
+        ).scalars()
+    )
+    taken_emails = set(
+        db.session.execute(
+            db.select(User.email).where(User.email.in_(emails))
+        ).scalars()
+    )
+
+    accepted = []
+    for row_number, user in parsed:
+        username, email = user["username"], user["email"]
+        if username in taken_usernames or username in seen_usernames:
+            results.append(_error(row_number, "Username already exists"))
+        elif email in taken_emails or email in seen_emails:
+            results.append(_error(row_number, "Email already exists"))
+        else:
+            seen_usernames.add(username)
+            seen_emails.add(email)
+            accepted.append((row_number, user))
+
+    if not accepted:
+        return 0
+
+    hashes = hash_map([user.pop("password") for _, user in accepted])
+    for (_, user), password_hash in zip(accepted, hashes):
+        user["password_hash"] = password_hash
+
+    try:
+        db.session.execute(User.__table__.insert(), [user for _, user in accepted])
+        db.session.commit()
+    except IntegrityError:
+        # Another writer took one of the names since the uniqueness check
+        db.session.rollback()
+        for row_number, _ in accepted:
+            results.append(_error(row_number, "Conflict, retry row"))
+        return 0
+
+    for row_number, user in accepted:
+        results.append(
+            {"row": row_number, "status": "created", "username": user["username"]}
+        )
+    return len(accepted)
+
+
+def _hash_pool_context():
+    """Start hash processes without forking this (multithreaded) process.
+
+    A forked child inherits locks held by the audit writer, revocation sync
+    and password hash threads and can deadlock on them.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def bulk_create_users(
+    records, chunk_size=DEFAULT_CHUNK_SIZE, workers=None, on_progress=None
+):
+    """Create users from (row_number, record) pairs in chunked transactions.
+
+    Password hashing is deliberately expensive, so it is spread over a
+    process pool of `workers` processes (all CPUs by default; 1 hashes in
+    the calling process). on_progress(processed, created, elapsed) is
+    called after every chunk.
+    """
+    workers = workers or os.cpu_count() or 1
+    hash_one = hash_function(current_app.config)
+    results = []
+    created = 0
+    seen_usernames = set()
+    seen_emails = set()
+    started = time.perf_counter()
+
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=_hash_pool_context()
+        )
+    try:
+        if executor:
+
+            def hash_map(passwords):
+                chunksize = max(1, len(passwords) // (workers * 4))
+                return executor.map(hash_one, passwords, chunksize=chunksize)
+
+        else:
+
+            def hash_map(passwords):
+                return map(hash_one, passwords)
+
+        for chunk in _chunks(records, chunk_size):
+            created += _create_user_chunk(
+                chunk, results, hash_map, seen_usernames, seen_emails
+            )
+            if on_progress:
+                on_progress(len(results), created, time.perf_counter() - started)
+    finally:
+        if executor:
+            executor.shutdown()
+
+    elapsed = time.perf_counter() - started
+    results.sort(key=lambda result: result["row"])
+    return {
+        "total": len(results),
+        "created": created,
+        "failed": len(results) - created,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(len(results) / elapsed, 1) if elapsed else None,
+        "results": results,
+    }
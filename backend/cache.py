@@ -0,0 +1,230 @@
+"""Response cache backends for read-heavy public endpoints"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from flask import current_app
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with a per-entry TTL.
+
+    Every invalidation bumps `version`; fills started before an invalidation
+    pass the version they read and are discarded, so a slow reader cannot
+    put a stale entry back after a write.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None, version=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if version is not None and version != self._version:
+                return False
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+        return True
+
+    def version(self):
+        with self._lock:
+            return self._version
+
+    def delete(self, *keys):
+        with self._lock:
+            self._version += 1
+            self._counters["invalidations"] += 1
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            self._version += 1
+            self._counters["invalidations"] += 1
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["size"] = len(self._entries)
+            stats["maxsize"] = self.maxsize
+        stats["backend"] = "memory"
+        return stats
+
+
+@lru_cache(maxsize=None)
+def cache_manager():
+    """The manager class exposing one LRUCache in a cache server process.
+
+    Built on first use: multiprocessing.managers is only needed with the
+    shared backend and is slow to import.
+    """
+    from multiprocessing.managers import BaseManager
+
+    class CacheManager(BaseManager):
+        pass
+
+    return CacheManager
+
+
+class SharedCache:
+    """Client for an LRUCache hosted by `flask cache-server`.
+
+    All workers talk to the same process, so an invalidation in one worker
+    is seen by every other. Connection errors count as misses rather than
+    failing the request.
+    """
+
+    def __init__(self, address, authkey):
+        self.address = address
+        self.authkey = authkey
+        self.errors = 0
+        self._remote = None
+        self._lock = threading.Lock()
+
+    def _cache(self):
+        if self._remote is None:
+            with self._lock:
+                if self._remote is None:
+                    CacheManager = cache_manager()
+                    CacheManager.register("get_cache")
+                    manager = CacheManager(
+                        address=self.address, authkey=self.authkey
+                    )
+                    manager.connect()
+                    self._remote = manager.get_cache()
+        return self._remote
+
+    def _call(self, method, *args, default=None, **kwargs):
+        try:
+            return getattr(self._cache(), method)(*args, **kwargs)
+        except (OSError, EOFError):
+            self.errors += 1
+            self._remote = None
+            current_app.logger.warning(
+                "Shared cache at %s unavailable", self.address
+            )
+            return default
+
+    def get(self, key):
+        return self._call("get", key)
+
+    def set(self, key, value, ttl=None, version=None):
+        return self._call(
+            "set", key, value, ttl=ttl, version=version, default=False
+        )
+
+    def version(self):
+        # An unknown version rejects the following fill instead of forcing it
+        return self._call("version", default=-1)
+
+    def delete(self, *keys):
+        self._call("delete", *keys)
+
+    def delete_prefix(self, prefix):
+        self._call("delete_prefix", prefix)
+
+    def clear(self):
+        self._call("clear")
+
+    def stats(self):
+        stats = self._call("stats", default={})
+        stats["errors"] = self.errors
+        stats["backend"] = "shared"
+        return stats
+
+
+def parse_address(value):
+    host, _, port = value.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def serve_shared_cache(address, authkey, maxsize, ttl, rate_limits=None):
+    """Run the cache server process used by SharedCache (blocks forever).
+
+    `rate_limits`, if given, is also served for RATE_LIMIT_BACKEND=shared.
+    """
+    cache = LRUCache(maxsize=maxsize, ttl=ttl)
+    CacheManager = cache_manager()
+    CacheManager.register("get_cache", callable=lambda: cache)
+    if rate_limits is not None:
+        CacheManager.register("get_rate_limits", callable=lambda: rate_limits)
+    manager = CacheManager(address=address, authkey=authkey)
+    manager.get_server().serve_forever()
+
+
+def init_cache(app):
+    app.config.setdefault("RESPONSE_CACHE_BACKEND", "memory")  # or "shared"
+    app.config.setdefault("RESPONSE_CACHE_SIZE", 1024)
+    app.config.setdefault("RESPONSE_CACHE_TTL", 60)
+    app.config.setdefault("RESPONSE_CACHE_ADDRESS", "127.0.0.1:5055")
+    app.config.setdefault("RESPONSE_CACHE_AUTHKEY", app.config["JWT_SECRET_KEY"])
+
+    if app.config["RESPONSE_CACHE_BACKEND"] == "shared":
+        cache = SharedCache(
+            parse_address(app.config["RESPONSE_CACHE_ADDRESS"]),
+            app.config["RESPONSE_CACHE_AUTHKEY"].encode(),
+        )
+    else:
+        cache = LRUCache(
+            maxsize=app.config["RESPONSE_CACHE_SIZE"],
+            ttl=app.config["RESPONSE_CACHE_TTL"],
+        )
+    app.extensions["response_cache"] = cache
+
+
+def get_cache():
+    return current_app.extensions["response_cache"]
+
+
+# ============ COURSE CATALOGUE KEYS ============
+
+COURSE_LIST_PREFIX = "courses:list:"
+
+
+def course_list_key(query_string):
+    return COURSE_LIST_PREFIX + query_string
+
+
+def course_key(course_id):
+    return f"courses:item:{course_id}"
+
+
+def invalidate_course(course_id):
+    """Drop the cached course and every cached course listing."""
+    cache = get_cache()
+    cache.delete(course_key(course_id))
+    cache.delete_prefix(COURSE_LIST_PREFIX)
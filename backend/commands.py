@@ -0,0 +1,302 @@
+"""Flask CLI commands for Campus Hub maintenance tasks"""
+
+import json
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from audit import ARCHIVE_BATCH_SIZE, archive_audit_log
+from blobstore import decode_data_url, get_blobstore, media_url
+from bulk import (
+    DEFAULT_CHUNK_SIZE,
+    bulk_create_users,
+    bulk_enroll,
+    detect_format,
+    iter_records,
+    publish_seat_counts,
+)
+from cache import get_cache, parse_address, serve_shared_cache
+from migrations import check_schema, upgrade
+from ratelimit import TokenBuckets
+from models import db, reconcile_enrolled_counts, AuditLog, User
+from revocation import get_revocation_store
+from seed import seed_database
+
+
+def _invalidate_server_caches():
+    """Clear the course cache the servers read, or warn that it was not"""
+    config = current_app.config
+    cache = get_cache()
+    if config["RESPONSE_CACHE_BACKEND"] == "shared":
+        errors = cache.errors
+        cache.clear()
+        if cache.errors == errors:
+            return
+        reason = f"the cache server at {config['RESPONSE_CACHE_ADDRESS']} is down"
+    else:
+        reason = "RESPONSE_CACHE_BACKEND is not shared"
+    click.echo(
+        f"Warning: {reason}; running servers may serve old course data "
+        f"for up to {config['RESPONSE_CACHE_TTL']}s",
+        err=True,
+    )
+
+
+@click.command("seed")
+@with_appcontext
+def seed_command():
+    """Load demo users, courses and enrollments into an empty database."""
+    if db.session.query(User.id).first() is not None:
+        click.echo("Database already has users; not seeding")
+        return
+    seed_database()
+    click.echo("Seeded demo data")
+
+
+@click.command("reconcile-enrollment-counts")
+@with_appcontext
+def reconcile_enrollment_counts_command():
+    """Repair Course.enrolled_count values that drifted from enrollments."""
+    repaired = reconcile_enrolled_counts()
+    if repaired:
+        _invalidate_server_caches()
+    click.echo(f"Repaired enrolled_count on {repaired} course(s)")
+
+
+@click.command("migrate-profile-pictures")
+@click.option("--batch-size", default=100, show_default=True)
+@with_appcontext
+def migrate_profile_pictures_command(batch_size):
+    """Move inline base64 profile pictures into the blob store."""
+    store = get_blobstore()
+    moved = failed = 0
+    last_id = 0
+
+    while True:
+        users = (
+            User.query.filter(
+                User.id > last_id, User.profile_picture_url.like("data:%")
+            )
+            .order_by(User.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not users:
+            break
+
+        for user in users:
+            last_id = user.id
+            try:
+                digest = store.put_bytes(decode_data_url(user.profile_picture_url))
+            except ValueError:
+                failed += 1
+                click.echo(f"Skipped user {user.id}: undecodable picture", err=True)
+                continue
+            user.profile_picture_url = media_url(digest)
+            moved += 1
+
+        db.session.commit()
+        # Drop the loaded base64 strings before the next batch
+        db.session.expunge_all()
+
+    click.echo(f"Moved {moved} profile picture(s), skipped {failed}")
+
+
+@click.command("cache-server")
+@with_appcontext
+def cache_server_command():
+    """Run the shared response cache process used by RESPONSE_CACHE_BACKEND=shared.
+
+    It also holds the rate limit buckets for RATE_LIMIT_BACKEND=shared.
+    """
+    config = current_app.config
+    address = parse_address(config["RESPONSE_CACHE_ADDRESS"])
+    click.echo(f"Serving shared response cache on {address[0]}:{address[1]}")
+    serve_shared_cache(
+        address,
+        config["RESPONSE_CACHE_AUTHKEY"].encode(),
+        config["RESPONSE_CACHE_SIZE"],
+        config["RESPONSE_CACHE_TTL"],
+        rate_limits=TokenBuckets(),
+    )
+
+
+@click.command("seat-stream-server")
+@with_appcontext
+def seat_stream_server_command():
+    """Run the asyncio relay serving seat events for SEAT_EVENTS_BACKEND=relay."""
+    from seat_relay import serve_seat_relay
+
+    config = current_app.config
+    publish_address = parse_address(config["SEAT_EVENTS_ADDRESS"])
+    stream_address = parse_address(config["SEAT_STREAM_ADDRESS"])
+    click.echo(
+        f"Accepting seat events on {publish_address[0]}:{publish_address[1]}, "
+        f"serving streams on {stream_address[0]}:{stream_address[1]}"
+    )
+    serve_seat_relay(
+        publish_address,
+        stream_address,
+        config["SEAT_EVENTS_AUTHKEY"].encode(),
+        config["SEAT_EVENTS_BACKLOG"],
+        config["SEAT_STREAM_KEEPALIVE"],
+    )
+
+
+@click.command("bulk-enroll")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "fmt", type=click.Choice(["csv", "ndjson"]))
+@click.option("--chunk-size", default=DEFAULT_CHUNK_SIZE, show_default=True)
+@click.option(
+    "--report", type=click.Path(dir_okay=False), help="Write the JSON report here."
+)
+@with_appcontext
+def bulk_enroll_command(path, fmt, chunk_size, report):
+    """Enroll (student, course_id) pairs from a CSV or NDJSON file.
+
+    Rows skip the waitlist, as with POST /enrollments/bulk.
+    """
+    fmt = detect_format(filename=path, explicit=fmt)
+
+    def progress(course_ids, processed):
+        publish_seat_counts(course_ids)
+        click.echo(f"Processed {processed} rows", err=True)
+
+    with open(path, "rb") as f:
+        result = bulk_enroll(
+            iter_records(f, fmt), chunk_size=chunk_size, on_chunk=progress
+        )
+    if result["enrolled"]:
+        _invalidate_server_caches()
+        if current_app.config["SEAT_EVENTS_BACKEND"] != "relay":
+            # Memory-backend events only reach streams served by this process
+            click.echo(
+                "Warning: SEAT_EVENTS_BACKEND is not relay; open seat streams "
+                "were not updated",
+                err=True,
+            )
+
+    click.echo(
+        f"Enrolled {result['enrolled']} of {result['total']} rows, "
+        f"{result['failed']} failed"
+    )
+    if report:
+        with open(report, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+@click.command("bulk-create-users")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "fmt", type=click.Choice(["csv", "ndjson"]))
+@click.option("--chunk-size", default=DEFAULT_CHUNK_SIZE, show_default=True)
+@click.option("--workers", type=int, help="Hashing processes [default: all CPUs]")
+@click.option(
+    "--report", type=click.Path(dir_okay=False), help="Write the JSON report here."
+)
+@with_appcontext
+def bulk_create_users_command(path, fmt, chunk_size, workers, report):
+    """Create users from a username,email,password[,role,full_name] roster."""
+    fmt = detect_format(filename=path, explicit=fmt)
+
+    def progress(processed, created, elapsed):
+        rate = processed / elapsed if elapsed else 0
+        click.echo(
+            f"Processed {processed} rows, created {created} ({rate:.0f} rows/s)",
+            err=True,
+        )
+
+    with open(path, "rb") as f:
+        result = bulk_create_users(
+            iter_records(f, fmt),
+            chunk_size=chunk_size,
+            workers=workers or current_app.config["BULK_HASH_WORKERS"],
+            on_progress=progress,
+        )
+
+    click.echo(
+        f"Created {result['created']} of {result['total']} users, "
+        f"{result['failed']} failed in {result['elapsed_seconds']}s "
+        f"({result['rows_per_second']} rows/s)"
+    )
+    if report:
+        with open(report, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+@click.command("db-upgrade")
+@with_appcontext
+def db_upgrade_command():
+    """Apply pending schema migrations."""
+    applied = upgrade(db.engine)
+    for version, description in applied:
+        click.echo(f"Applied migration {version}: {description}")
+    if not applied:
+        click.echo("Schema is up to date")
+
+
+@click.command("db-check")
+@with_appcontext
+def db_check_command():
+    """Compare the live schema with the models; exit 1 on drift."""
+    problems = check_schema(db.engine)
+    for problem in problems:
+        click.echo(problem, err=True)
+    if problems:
+        raise SystemExit(1)
+    click.echo("Schema matches the models")
+
+
+@click.command("audit-archive")
+@click.option("--older-than-days", type=int, help="[default: AUDIT_RETENTION_DAYS]")
+@click.option("--archive-dir", help="[default: AUDIT_ARCHIVE_DIR]")
+@click.option("--batch-size", default=ARCHIVE_BATCH_SIZE, show_default=True)
+@click.option("--dry-run", is_flag=True, help="Only count the rows to archive.")
+@with_appcontext
+def audit_archive_command(older_than_days, archive_dir, batch_size, dry_run):
+    """Archive old audit rows to per-month gzip files and delete them."""
+    config = current_app.config
+    days = older_than_days
+    if days is None:
+        days = config["AUDIT_RETENTION_DAYS"]
+    cutoff = datetime.utcnow() - timedelta(days=days)
+
+    if dry_run:
+        count = AuditLog.query.filter(AuditLog.timestamp < cutoff).count()
+        click.echo(f"{count} audit row(s) older than {cutoff.isoformat()}")
+        return
+
+    def progress(archived):
+        click.echo(f"Archived {archived} rows", err=True)
+
+    archived, paths = archive_audit_log(
+        cutoff,
+        archive_dir or config["AUDIT_ARCHIVE_DIR"],
+        batch_size=batch_size,
+        on_batch=progress,
+    )
+    for path in paths:
+        click.echo(f"Wrote {path}")
+    click.echo(f"Archived and deleted {archived} audit row(s) before {cutoff.date()}")
+
+
+@click.command("prune-revoked-tokens")
+@with_appcontext
+def prune_revoked_tokens_command():
+    """Delete revoked_tokens rows whose tokens have expired anyway."""
+    deleted = get_revocation_store().purge_expired()
+    click.echo(f"Deleted {deleted} expired revoked token(s)")
+
+
+def register_commands(app):
+    """Attach the maintenance commands to the app's CLI."""
+    app.cli.add_command(db_upgrade_command)
+    app.cli.add_command(db_check_command)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(reconcile_enrollment_counts_command)
+    app.cli.add_command(migrate_profile_pictures_command)
+    app.cli.add_command(cache_server_command)
+    app.cli.add_command(seat_stream_server_command)
+    app.cli.add_command(bulk_enroll_command)
+    app.cli.add_command(bulk_create_users_command)
+    app.cli.add_command(audit_archive_command)
+    app.cli.add_command(prune_revoked_tokens_command)
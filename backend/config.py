@@ -0,0 +1,108 @@
+"""Configuration profiles for the Campus Hub app factory"""
+
+import os
+
+
+class Config:
+    """Settings shared by every profile."""
+
+    SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///campus_hub.db")
+
+    # JWT Configuration
+    JWT_SECRET_KEY = os.getenv(
+        "JWT_SECRET_KEY", "your-super-secret-jwt-key-change-in-production-12345"
+    )
+
+    # Seconds between each process pulling token revocations from the database;
+    # other workers accept a logged-out access token for up to this long
+    REVOCATION_SYNC_INTERVAL = float(os.getenv("REVOCATION_SYNC_INTERVAL", 5))
+
+    # Course catalogue cache: "memory" (per process) or "shared" (flask cache-server)
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_ADDRESS = os.getenv("RESPONSE_CACHE_ADDRESS", "127.0.0.1:5055")
+
+    # Live seat events: "memory" (in-process) or "relay" (flask seat-stream-server)
+    SEAT_EVENTS_BACKEND = os.getenv("SEAT_EVENTS_BACKEND", "memory")
+    SEAT_EVENTS_ADDRESS = os.getenv("SEAT_EVENTS_ADDRESS", "127.0.0.1:5056")
+    SEAT_STREAM_ADDRESS = os.getenv("SEAT_STREAM_ADDRESS", "127.0.0.1:5057")
+
+    # Reverse proxies in front of the app that append to X-Forwarded-For; the
+    # client address (used by the "ip" rate limits) is read from that header
+    PROXY_FIX_X_FOR = int(os.getenv("PROXY_FIX_X_FOR", 0))
+
+    # Rate limits and concurrency caps on login and enrollment (see ratelimit.py);
+    # "shared" keeps the buckets in `flask cache-server` for all workers
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+
+    # Password hashing; stored hashes are upgraded on login when this changes
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256")
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", 32))
+
+    # Processes used to hash passwords during bulk user imports
+    BULK_HASH_WORKERS = int(os.getenv("BULK_HASH_WORKERS", os.cpu_count() or 1))
+
+    # SQLite connection settings, applied on every new connection
+    SQLITE_JOURNAL_MODE = "WAL"
+    SQLITE_SYNCHRONOUS = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+
+    # Request metrics and the slow-query log
+    INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION_ENABLED", "1") == "1"
+    SLOW_QUERY_MS = int(os.getenv("SLOW_QUERY_MS", 200))
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+    # Connection pool settings for server databases (MySQL, PostgreSQL)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING = True
+
+
+class DevelopmentConfig(Config):
+    # Apply pending schema migrations when the app starts
+    AUTO_MIGRATE = True
+
+
+class ProductionConfig(Config):
+    # Run `flask db-upgrade` as a deploy step instead
+    AUTO_MIGRATE = False
+
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    # Stay below MySQL's default wait_timeout of 8 hours with a wide margin
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 3600))
+
+    # A write only invalidates the cache of the worker that handled it, so
+    # gunicorn workers share one cache or the others serve stale courses
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "shared")
+
+    # Gunicorn workers each number and fan out only their own events, and an
+    # in-process stream pins a gthread thread, so streams go through the relay
+    SEAT_EVENTS_BACKEND = os.getenv("SEAT_EVENTS_BACKEND", "relay")
+    # If the memory backend is forced anyway, leave threads for other requests
+    SEAT_STREAM_MAX_CLIENTS = int(
+        os.getenv(
+            "SEAT_STREAM_MAX_CLIENTS",
+            max(1, int(os.getenv("GUNICORN_THREADS", 4)) // 2),
+        )
+    )
+
+
+class TestingConfig(Config):
+    TESTING = True
+    AUTO_MIGRATE = True
+    # Replaced per test with a throwaway database file (tests/conftest.py)
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    # Every test request comes from the same client address
+    RATE_LIMIT_ENABLED = False
+
+
+config_by_name = {
+    "development": DevelopmentConfig,
+    "production": ProductionConfig,
+    "testing": TestingConfig,
+}
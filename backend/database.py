@@ -0,0 +1,116 @@
+"""Database engine tuning and connection pool statistics"""
+
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+
+class PoolWaitStats:
+    """Running totals of the time spent waiting for a pooled connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def snapshot(self):
+        with self._lock:
+            average = self.total_wait / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "wait_total_ms": round(self.total_wait * 1000, 3),
+                "wait_avg_ms": round(average * 1000, 3),
+                "wait_max_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait_stats.record(time.perf_counter() - start)
+
+
+def _is_sqlite_memory(url):
+    if url.get_backend_name() != "sqlite":
+        return False
+    return url.database in (None, "", ":memory:")
+
+
+def engine_options(config):
+    """Build SQLALCHEMY_ENGINE_OPTIONS for the configured database URL"""
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+
+    if _is_sqlite_memory(url):
+        # In-memory SQLite needs Flask-SQLAlchemy's single shared connection
+        return {}
+
+    options = {"poolclass": TimedQueuePool}
+    if url.get_backend_name() == "sqlite":
+        # SQLite connections are cheap local file handles; never recycle them
+        options.update(pool_size=config["DB_POOL_SIZE"], max_overflow=-1)
+        return options
+
+    options.update(
+        pool_size=config["DB_POOL_SIZE"],
+        max_overflow=config["DB_MAX_OVERFLOW"],
+        pool_timeout=config["DB_POOL_TIMEOUT"],
+        pool_recycle=config["DB_POOL_RECYCLE"],
+        pool_pre_ping=config["DB_POOL_PRE_PING"],
+    )
+    return options
+
+
+def install_sqlite_pragmas(engine, config):
+    """Apply WAL and related pragmas to every new SQLite connection"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    pragmas = (
+        f"PRAGMA journal_mode={config['SQLITE_JOURNAL_MODE']}",
+        f"PRAGMA synchronous={config['SQLITE_SYNCHRONOUS']}",
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}",
+    )
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def engine_stats(engine):
+    """Describe the engine's pool occupancy and checkout wait times"""
+    pool = engine.pool
+    stats = {
+        "dialect": engine.dialect.name,
+        "pool_class": type(pool).__name__,
+        "pool_status": pool.status(),
+    }
+    if isinstance(pool, QueuePool):
+        stats.update(
+            pool_size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    stats.update(pool_wait_stats.snapshot())
+    return stats
@@ -0,0 +1,250 @@
+"""Live seat-availability events, pushed to browsers with Server-Sent Events.
+
+Routes publish a "seats" event with a course's current enrolled_count and
+capacity after every commit that can change them, and "course_deleted"
+when a course goes away. Subscribers replay from an in-memory backlog, so
+a client reconnecting with Last-Event-ID misses nothing; one that fell
+too far behind gets a "resync" event and re-fetches the catalogue.
+
+Backends (SEAT_EVENTS_BACKEND):
+
+    memory  Events stay in this process and GET /courses/seats/stream
+            serves them. Each stream holds a server thread, so it suits
+            development and single-process servers (development default).
+    relay   Events go to `flask seat-stream-server`, an asyncio process
+            that serves the stream to every client with one coroutine per
+            connection. Route /courses/seats/stream to it (production
+            default).
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from collections import deque
+from flask import current_app
+from cache import parse_address
+
+SEAT_EVENT = "seats"
+DELETED_EVENT = "course_deleted"
+RESYNC_EVENT = "resync"
+STREAM_PATH = "/courses/seats/stream"
+KEEPALIVE = ": keepalive\n\n"
+# Browsers reconnect this many milliseconds after a dropped stream
+RETRY_MS = 3000
+# Publishers give a down relay this long before trying to reconnect, so
+# requests do not each wait on a connect timeout meanwhile
+RELAY_CONNECT_TIMEOUT = 0.5
+RELAY_RETRY_INTERVAL = 5.0
+
+
+def format_event(event, data, event_id=None):
+    """Encode one SSE message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+def parse_last_event_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class EventLog:
+    """Bounded backlog of numbered events (not thread-safe)."""
+
+    def __init__(self, backlog):
+        self.last_id = 0
+        self._events = deque(maxlen=backlog)
+
+    def append(self, event, data):
+        self.last_id += 1
+        self._events.append((self.last_id, format_event(event, data, self.last_id)))
+        return self.last_id
+
+    def since(self, last_id):
+        """Messages after `last_id`, or None if the client must resync.
+
+        An id ahead of this log was numbered by another process or before
+        a restart, so nothing in between can be replayed either.
+        """
+        if last_id > self.last_id:
+            return None
+        if last_id == self.last_id:
+            return []
+        if not self._events or self._events[0][0] > last_id + 1:
+            return None
+        return [message for event_id, message in self._events if event_id > last_id]
+
+    def resync(self):
+        return format_event(RESYNC_EVENT, {}, self.last_id)
+
+
+class MemoryBroker:
+    """In-process fan-out: one backlog, subscribers wait on a condition."""
+
+    def __init__(self, backlog, keepalive, max_subscribers):
+        self.keepalive = keepalive
+        self.max_subscribers = max_subscribers
+        self.subscribers = 0
+        self.published = 0
+        self._log = EventLog(backlog)
+        self._condition = threading.Condition()
+
+    def publish(self, event, data):
+        with self._condition:
+            self._log.append(event, data)
+            self.published += 1
+            self._condition.notify_all()
+
+    def try_subscribe(self):
+        with self._condition:
+            if self.subscribers >= self.max_subscribers:
+                return False
+            self.subscribers += 1
+            return True
+
+    def unsubscribe(self):
+        with self._condition:
+            self.subscribers -= 1
+
+    def stream(self, last_id=None):
+        """Yield SSE messages after `last_id` until the client disconnects"""
+        with self._condition:
+            if last_id is None:
+                last_id = self._log.last_id
+        yield f"retry: {RETRY_MS}\n\n"
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._log.last_id != last_id, self.keepalive
+                )
+                messages = self._log.since(last_id)
+                if messages is None:
+                    messages = [self._log.resync()]
+                last_id = self._log.last_id
+            yield "".join(messages) if messages else KEEPALIVE
+
+    def stats(self):
+        return {
+            "backend": "memory",
+            "subscribers": self.subscribers,
+            "published": self.published,
+            "last_event_id": self._log.last_id,
+        }
+
+
+class RelayPublisher:
+    """Sends events to `flask seat-stream-server` over a local TCP socket.
+
+    Events are newline-delimited JSON after an authkey line. Delivery is
+    best effort: if the relay is down the event is dropped, counted and
+    logged, and clients catch up from the next one. After a failed
+    connect, events are dropped without trying again for
+    RELAY_RETRY_INTERVAL seconds.
+    """
+
+    def __init__(self, address, authkey):
+        self.address = address
+        self.authkey = authkey
+        self.published = 0
+        self.errors = 0
+        self.dropped = 0
+        self._socket = None
+        self._pid = None
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        sock = socket.create_connection(self.address, timeout=RELAY_CONNECT_TIMEOUT)
+        sock.sendall(self.authkey + b"\n")
+        return sock
+
+    def publish(self, event, data):
+        line = json.dumps({"event": event, "data": data}).encode() + b"\n"
+        with self._lock:
+            # Sockets inherited across fork are shared with the parent
+            if self._pid != os.getpid():
+                self._socket, self._pid, self._retry_at = None, os.getpid(), 0.0
+            if self._socket is None and time.monotonic() < self._retry_at:
+                self.dropped += 1
+                return
+            for _ in range(2):
+                stale = self._socket is not None
+                try:
+                    if self._socket is None:
+                        self._socket = self._connect()
+                    self._socket.sendall(line)
+                    self.published += 1
+                    return
+                except OSError:
+                    if self._socket is not None:
+                        self._socket.close()
+                        self._socket = None
+                    # A stale connection fails once; a fresh one is not retried
+                    if not stale:
+                        break
+            self.errors += 1
+            self._retry_at = time.monotonic() + RELAY_RETRY_INTERVAL
+        current_app.logger.warning(
+            "Seat event relay at %s:%s unavailable, retrying in %ss",
+            *self.address,
+            RELAY_RETRY_INTERVAL,
+        )
+
+    def stats(self):
+        return {
+            "backend": "relay",
+            "published": self.published,
+            "errors": self.errors,
+            "dropped": self.dropped,
+        }
+
+
+def init_seat_events(app):
+    app.config.setdefault("SEAT_EVENTS_BACKEND", "memory")  # or "relay"
+    app.config.setdefault("SEAT_EVENTS_BACKLOG", 1000)
+    app.config.setdefault("SEAT_STREAM_KEEPALIVE", 15)
+    # Streams served by this app each hold a thread; the relay has no cap
+    app.config.setdefault("SEAT_STREAM_MAX_CLIENTS", 50)
+    app.config.setdefault("SEAT_EVENTS_ADDRESS", "127.0.0.1:5056")
+    app.config.setdefault("SEAT_STREAM_ADDRESS", "127.0.0.1:5057")
+    app.config.setdefault("SEAT_EVENTS_AUTHKEY", app.config["JWT_SECRET_KEY"])
+
+    if app.config["SEAT_EVENTS_BACKEND"] == "relay":
+        events = RelayPublisher(
+            parse_address(app.config["SEAT_EVENTS_ADDRESS"]),
+            app.config["SEAT_EVENTS_AUTHKEY"].encode(),
+        )
+    else:
+        events = MemoryBroker(
+            app.config["SEAT_EVENTS_BACKLOG"],
+            app.config["SEAT_STREAM_KEEPALIVE"],
+            app.config["SEAT_STREAM_MAX_CLIENTS"],
+        )
+    app.extensions["seat_events"] = events
+
+
+def get_seat_events():
+    return current_app.extensions["seat_events"]
+
+
+def publish_seats(course_id, enrolled_count, capacity):
+    get_seat_events().publish(
+        SEAT_EVENT,
+        {
+            "course_id": course_id,
+            "enrolled_count": enrolled_count,
+            "capacity": capacity,
+        },
+    )
+
+
+def publish_course_deleted(course_id):
+    get_seat_events().publish(DELETED_EVENT, {"course_id": course_id})
@@ -0,0 +1,52 @@
+"""Background workers started lazily, once per process.
+
+Gunicorn forks its workers from a master that has already built the app,
+and threads do not survive fork. Objects that own a thread or a thread
+pool therefore start it on first use in each process rather than in
+init_app.
+"""
+
+import os
+import threading
+
+_start_lock = threading.Lock()
+
+
+def _reset_start_lock():
+    # A lock held by another thread at fork time would never be released
+    global _start_lock
+    _start_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_start_lock)
+
+
+class PerProcessWorker:
+    """Mixin owning one background worker per process.
+
+    Subclasses implement _start_worker(), which creates and returns the
+    worker, and call _ensure_worker() before each use. A child process
+    sees the parent's worker as missing and starts its own.
+    """
+
+    _worker = None
+    _worker_pid = None
+
+    def _ensure_worker(self):
+        """This process's worker, started on the first call"""
+        if self._worker is not None and self._worker_pid == os.getpid():
+            return self._worker
+        with _start_lock:
+            if self._worker is None or self._worker_pid != os.getpid():
+                self._worker = self._start_worker()
+                self._worker_pid = os.getpid()
+            return self._worker
+
+    def _detach_worker(self):
+        """Forget the worker; returns it if this process started it"""
+        worker, self._worker = self._worker, None
+        return worker if self._worker_pid == os.getpid() else None
+
+    def _start_worker(self):
+        raise NotImplementedError
@@ -0,0 +1,38 @@
+"""Gunicorn settings for Campus Hub: gunicorn -c gunicorn.conf.py wsgi:app"""
+
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", 2 * (os.cpu_count() or 1) + 1))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+# Build the app once in the master; workers fork from it ready to serve
+preload_app = True
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then, staggered so they do not restart together
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 5000))
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+
+
+def post_fork(server, worker):
+    """Drop pooled connections inherited from the master after preloading."""
+    from models import db
+    from wsgi import app
+
+    with app.app_context():
+        # close=False leaves the master's sockets alone
+        db.engine.dispose(close=False)
+
+    # In-process seat streams hold a thread each; keep one free for requests
+    events = app.extensions["seat_events"]
+    if hasattr(events, "max_subscribers") and events.max_subscribers >= threads:
+        events.max_subscribers = max(1, threads - 1)
+        server.log.warning(
+            "Capped in-process seat streams at %s per worker", events.max_subscribers
+        )
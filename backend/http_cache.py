@@ -0,0 +1,51 @@
+"""HTTP conditional request helpers (ETag / Last-Modified / 304)"""
+
+import hashlib
+from datetime import timezone
+from flask import make_response, request
+
+
+def make_etag(*parts):
+    """Build a strong ETag value from the parts identifying a representation"""
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _as_utc(value):
+    if value is None:
+        return None
+    # Model timestamps are naive UTC; HTTP dates have one-second resolution
+    return value.replace(tzinfo=timezone.utc, microsecond=0)
+
+
+def not_modified(etag, last_modified=None, use_modified_since=True):
+    """Return True when the request's validators match the current version.
+
+    If-None-Match takes precedence over If-Modified-Since. Collections pass
+    use_modified_since=False because a deleted row does not move their
+    max(updated_at), so only the ETag fingerprint can detect the change.
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+
+    if use_modified_since and last_modified and request.if_modified_since:
+        return _as_utc(last_modified) <= request.if_modified_since
+
+    return False
+
+
+def add_validators(response, etag, last_modified=None, private=False):
+    """Attach ETag/Last-Modified and make clients revalidate before reuse"""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = _as_utc(last_modified)
+    response.cache_control.no_cache = True
+    if private:
+        response.cache_control.private = True
+    return response
+
+
+def not_modified_response(etag, last_modified=None, private=False):
+    """Build an empty 304 response carrying the current validators"""
+    response = make_response("", 304)
+    return add_validators(response, etag, last_modified, private)
@@ -0,0 +1,303 @@
+"""Per-request latency and SQL instrumentation with a Prometheus endpoint.
+
+Every request records its wall time, the time spent in SQL and the number
+of statements it executed, aggregated per route into histograms. SQL
+statements slower than SLOW_QUERY_MS are logged with the route that ran
+them. Metrics are kept per process; scrape every worker.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from database import engine_stats
+from models import db
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+UNMATCHED_ROUTE = "unmatched"
+METRIC_PREFIX = "campus_hub"
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout (not thread-safe)."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            total += count
+            yield bound, total
+
+
+class RequestMetrics:
+    """Thread-safe per-route aggregates of request and SQL timings."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+        self._responses = {}
+        self._slow_queries = {}
+
+    def observe(self, method, route, status, wall, db_time, statements):
+        key = (method, route)
+        with self._lock:
+            histograms = self._routes.get(key)
+            if histograms is None:
+                histograms = self._routes[key] = (
+                    Histogram(LATENCY_BUCKETS),
+                    Histogram(LATENCY_BUCKETS),
+                    Histogram(STATEMENT_BUCKETS),
+                )
+            histograms[0].observe(wall)
+            histograms[1].observe(db_time)
+            histograms[2].observe(statements)
+            response_key = (method, route, status)
+            self._responses[response_key] = self._responses.get(response_key, 0) + 1
+
+    def slow_query(self, route):
+        with self._lock:
+            self._slow_queries[route] = self._slow_queries.get(route, 0) + 1
+
+    def snapshot(self):
+        """Copy the aggregates so rendering happens outside the lock"""
+        with self._lock:
+            routes = {}
+            for key, histograms in self._routes.items():
+                copies = []
+                for histogram in histograms:
+                    copy = Histogram(histogram.buckets)
+                    copy.counts = list(histogram.counts)
+                    copy.sum, copy.count = histogram.sum, histogram.count
+                    copies.append(copy)
+                routes[key] = copies
+            return routes, dict(self._responses), dict(self._slow_queries)
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+            self._responses.clear()
+            self._slow_queries.clear()
+
+
+def _route():
+    rule = request.url_rule if has_request_context() else None
+    return rule.rule if rule is not None else UNMATCHED_ROUTE
+
+
+# ============ HOOKS ============
+
+
+def _install_sql_hooks(app, engine):
+    metrics = app.extensions["request_metrics"]
+    slow_seconds = app.config["SLOW_QUERY_MS"] / 1000
+    log_chars = app.config["SLOW_QUERY_LOG_CHARS"]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_query(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def finish_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_start
+
+        in_request = has_request_context() and "metrics_start" in g
+        if in_request:
+            g.metrics_db_time += elapsed
+            g.metrics_statements += 1
+
+        if elapsed >= slow_seconds:
+            route = _route() if in_request else "-"
+            metrics.slow_query(route)
+            app.logger.warning(
+                "Slow query (%.1f ms) on %s: %s",
+                elapsed * 1000,
+                route,
+                " ".join(statement.split())[:log_chars],
+            )
+
+
+def _start_request():
+    g.metrics_start = time.perf_counter()
+    g.metrics_db_time = 0.0
+    g.metrics_statements = 0
+
+
+def _finish_request(response):
+    started = g.pop("metrics_start", None)
+    if started is None:
+        return response
+    wall = time.perf_counter() - started
+    current_app.extensions["request_metrics"].observe(
+        request.method,
+        _route(),
+        response.status_code,
+        wall,
+        g.metrics_db_time,
+        g.metrics_statements,
+    )
+    return response
+
+
+# ============ PROMETHEUS EXPORT ============
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _render_histogram(lines, name, help_text, series):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for (method, route), histogram in series:
+        labels = _labels(method=method, route=route)
+        for bound, total in histogram.cumulative():
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {total}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+def _render_gauges(lines, prefix, values, help_text):
+    for key, value in sorted(values.items()):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{key}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+
+
+def render_metrics(app):
+    """Render request, SQL, pool, cache and audit metrics in text format.
+
+    Must run inside an app context.
+    """
+    routes, responses, slow_queries = app.extensions["request_metrics"].snapshot()
+    series = sorted(routes.items())
+    lines = []
+
+    _render_histogram(
+        lines,
+        f"{METRIC_PREFIX}_request_duration_seconds",
+        "Wall time per request.",
+        [(key, histograms[0]) for key, histograms in series],
+    )
+    _render_histogram(
+        lines,
+        f"{METRIC_PREFIX}_request_db_seconds",
+        "Time spent executing SQL per request.",
+        [(key, histograms[1]) for key, histograms in series],
+    )
+    _render_histogram(
+        lines,
+        f"{METRIC_PREFIX}_request_statements",
+        "SQL statements executed per request.",
+        [(key, histograms[2]) for key, histograms in series],
+    )
+
+    name = f"{METRIC_PREFIX}_responses_total"
+    lines.append(f"# HELP {name} Responses by route and status code.")
+    lines.append(f"# TYPE {name} counter")
+    for (method, route, status), count in sorted(responses.items()):
+        labels = _labels(method=method, route=route, status=status)
+        lines.append(f"{name}{{{labels}}} {count}")
+
+    name = f"{METRIC_PREFIX}_slow_queries_total"
+    lines.append(f"# HELP {name} SQL statements over SLOW_QUERY_MS by route.")
+    lines.append(f"# TYPE {name} counter")
+    for route, count in sorted(slow_queries.items()):
+        lines.append(f"{name}{{{_labels(route=route)}}} {count}")
+
+    _render_gauges(
+        lines,
+        f"{METRIC_PREFIX}_db_pool",
+        engine_stats(db.engine),
+        "Connection pool statistic.",
+    )
+    if "response_cache" in app.extensions:
+        _render_gauges(
+            lines,
+            f"{METRIC_PREFIX}_response_cache",
+            app.extensions["response_cache"].stats(),
+            "Response cache statistic.",
+        )
+    if "password_hasher" in app.extensions:
+        _render_gauges(
+            lines,
+            f"{METRIC_PREFIX}_password_hasher",
+            app.extensions["password_hasher"].stats(),
+            "Password hashing pool statistic.",
+        )
+    if "rate_limiter" in app.extensions:
+        _render_gauges(
+            lines,
+            f"{METRIC_PREFIX}_rate_limits",
+            app.extensions["rate_limiter"].stats(),
+            "Rate limit and concurrency cap statistic.",
+        )
+    if "seat_events" in app.extensions:
+        _render_gauges(
+            lines,
+            f"{METRIC_PREFIX}_seat_events",
+            app.extensions["seat_events"].stats(),
+            "Seat event publishing statistic.",
+        )
+    if "token_revocation" in app.extensions:
+        _render_gauges(
+            lines,
+            f"{METRIC_PREFIX}_token_revocation",
+            app.extensions["token_revocation"].stats(),
+            "Token revocation store statistic.",
+        )
+    if "audit" in app.extensions:
+        _render_gauges(
+            lines,
+            f"{METRIC_PREFIX}_audit",
+            app.extensions["audit"].stats(),
+            "Audit writer statistic.",
+        )
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view():
+    token = current_app.config["METRICS_TOKEN"]
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return {"error": "Unauthorized"}, 401
+    body = render_metrics(current_app._get_current_object())
+    return body, 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+
+def init_instrumentation(app):
+    app.config.setdefault("INSTRUMENTATION_ENABLED", True)
+    app.config.setdefault("SLOW_QUERY_MS", 200)
+    app.config.setdefault("SLOW_QUERY_LOG_CHARS", 500)
+    app.config.setdefault("METRICS_PATH", "/metrics")
+    # When set, scrapers must send "Authorization: Bearer <token>"
+    app.config.setdefault("METRICS_TOKEN", None)
+
+    app.extensions["request_metrics"] = RequestMetrics()
+    if not app.config["INSTRUMENTATION_ENABLED"]:
+        return
+
+    with app.app_context():
+        _install_sql_hooks(app, db.engine)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.add_url_rule(app.config["METRICS_PATH"], "metrics", metrics_view)
@@ -1,12 +1,18 @@
 """JWT-based authentication module for Campus Hub"""
 
+from collections import OrderedDict
 from functools import wraps
 from flask import request, jsonify
 from werkzeug.security import generate_password_hash, check_password_hash
+import hashlib
 import jwt
 import os
+import threading
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
 from models import User
+from revocation import get_revocation_store
 
 # JWT Configuration
 SECRET_KEY = os.getenv(
@@ -15,6 +21,8 @@ SECRET_KEY = os.getenv(
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
 REFRESH_TOKEN_EXPIRE_DAYS = 30
+TOKEN_CACHE_SIZE = 4096
+TOKEN_CACHE_TTL_SECONDS = 300
 
 
 def create_access_token(user_id: int, username: str, role: str):
@@ -27,6 +35,7 @@ def create_access_token(user_id: int, username: str, role: str):
         "iat": now,
         "exp": now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
         "type": "access",
+        "jti": uuid.uuid4().hex,
     }
     token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
     return token
@@ -40,6 +49,7 @@ def create_refresh_token(user_id: int):
         "iat": now,
         "exp": now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
         "type": "refresh",
+        "jti": uuid.uuid4().hex,
     }
     token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
     return token
@@ -56,44 +66,132 @@ def verify_token(token: str):
         return None  # Invalid token
 
 
+class TokenCache:
+    """Bounded LRU cache of verified token payloads keyed by token digest.
+
+    Entries expire at the earlier of the token's `exp` claim and the cache
+    TTL, so a cached payload is never served for an expired token.
+    """
+
+    def __init__(self, maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str):
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str):
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, token: str, payload: dict):
+        expires_at = min(payload.get("exp", 0), time.time() + self.ttl)
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+token_cache = TokenCache()
+
+
+def verify_token_cached(token: str):
+    """Verify JWT token, reusing the payload of a recently verified token"""
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = verify_token(token)
+        if payload is not None:
+            token_cache.put(token, payload)
+    return payload
+
+
+def get_request_token():
+    """Extract the access token from the cookie or the Authorization header"""
+    # 1. Check cookies (Priority)
+    token = request.cookies.get("access_token")
+    if token:
+        return token
+
+    # 2. Fallback to Authorization header
+    auth_header = request.headers.get("Authorization")
+    if auth_header:
+        try:
+            scheme, token_part = auth_header.split()
+            if scheme.lower() == "bearer":
+                return token_part
+        except ValueError:
+            pass
+    return None
+
+
+def authenticate_request():
+    """Verify the request's access token and store user info on the request.
+
+    Returns None on success or an error response tuple to return as-is.
+    """
+    token = get_request_token()
+    if not token:
+        return jsonify({"error": "Missing authentication token"}), 401
+
+    # Verify token
+    payload = verify_token_cached(token)
+    if not payload:
+        return jsonify({"error": "Invalid or expired token"}), 401
+
+    # Check token type
+    if payload.get("type") != "access":
+        return jsonify({"error": "Invalid token type"}), 401
+
+    # Checked on every request, cached payload or not, so logout takes effect
+    if get_revocation_store().is_revoked(payload.get("jti")):
+        return jsonify({"error": "Token has been revoked"}), 401
+
+    # Store user info in request context
+    request.user_id = payload["user_id"]
+    request.username = payload["username"]
+    request.role = payload["role"]
+    request.token_jti = payload.get("jti")
+    request.token_exp = payload["exp"]
+    return None
+
+
 def token_required(f):
     """Decorator to protect routes requiring valid JWT token"""
 
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = None
-        
-        # 1. Check cookies (Priority)
-        if "access_token" in request.cookies:
-            token = request.cookies.get("access_token")
-        
-        # 2. Fallback to Authorization header
-        if not token:
-            auth_header = request.headers.get("Authorization")
-            if auth_header:
-                try:
-                    scheme, token_part = auth_header.split()
-                    if scheme.lower() == "bearer":
-                        token = token_part
-                except ValueError:
-                    pass
-
-        if not token:
-            return jsonify({"error": "Missing authentication token"}), 401
-
-        # Verify token
-        payload = verify_token(token)
-        if not payload:
-            return jsonify({"error": "Invalid or expired token"}), 401
-
-        # Check token type
-        if payload.get("type") != "access":
-            return jsonify({"error": "Invalid token type"}), 401
-
-        # Store user info in request context
-        request.user_id = payload["user_id"]
-        request.username = payload["username"]
-        request.role = payload["role"]
+        error = authenticate_request()
+        if error:
+            return error
 
         return f(*args, **kwargs)
 
@@ -112,43 +210,16 @@ def role_required(required_role):
     """Decorator to check if user has specific role"""
 
     def decorator(f):
-        @wraps(f)
         @wraps(f)
         def decorated(*args, **kwargs):
-            token = None
-            
-            # 1. Check cookies (Priority)
-            if "access_token" in request.cookies:
-                token = request.cookies.get("access_token")
-            
-            # 2. Fallback to Authorization header
-            if not token:
-                auth_header = request.headers.get("Authorization")
-                if auth_header:
-                    try:
-                        scheme, token_part = auth_header.split()
-                        if scheme.lower() == "bearer":
-                            token = token_part
-                    except ValueError:
-                        pass
-
-            if not token:
-                return jsonify({"error": "Missing authentication token"}), 401
-
-            # Verify token
-            payload = verify_token(token)
-            if not payload or payload.get("type") != "access":
-                return jsonify({"error": "Invalid or expired token"}), 401
+            error = authenticate_request()
+            if error:
+                return error
 
             # Check role
-            if payload.get("role") != required_role:
+            if request.role != required_role:
                 return jsonify({"error": "Insufficient permissions"}), 403
 
-            # Store user info in request context
-            request.user_id = payload["user_id"]
-            request.username = payload["username"]
-            request.role = payload["role"]
-
             return f(*args, **kwargs)
 
         return decorated
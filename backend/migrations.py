@@ -0,0 +1,295 @@
+"""Versioned schema migrations for Campus Hub
+
+Each migration is a function taking a SQLAlchemy Connection. Migrations
+inspect the live schema before changing it, so databases created by the
+old `db.create_all()` on boot upgrade cleanly. Applied versions are
+recorded in the schema_version table.
+
+Migrations never read the models: tables and indexes are spelled out as
+they were when the migration was written, so a fresh database goes
+through the same steps as an old one however the models change later.
+"""
+
+from datetime import datetime
+from sqlalchemy import inspect, text
+from models import db
+
+SCHEMA_VERSION_TABLE = "schema_version"
+
+schema_version = db.Table(
+    SCHEMA_VERSION_TABLE,
+    db.MetaData(),
+    db.Column("version", db.Integer, primary_key=True),
+    db.Column("description", db.String(255), nullable=False),
+    db.Column("applied_at", db.DateTime, nullable=False),
+)
+
+MIGRATIONS = []
+
+
+def migration(version, description):
+    """Register a migration function under a version number."""
+
+    def decorator(fn):
+        MIGRATIONS.append((version, description, fn))
+        return fn
+
+    return decorator
+
+
+# Tables as the first migrations created them (the baseline app's models)
+_frozen = db.MetaData()
+
+_users_v1 = db.Table(
+    "users",
+    _frozen,
+    db.Column("id", db.Integer, primary_key=True),
+    db.Column("username", db.String(50), unique=True, nullable=False),
+    db.Column("email", db.String(100), unique=True, nullable=False),
+    db.Column("password_hash", db.String(255), nullable=False),
+    db.Column("role", db.String(20), nullable=False),
+    db.Column("created_at", db.DateTime),
+    db.Column("updated_at", db.DateTime),
+    db.Column("full_name", db.String(100)),
+    db.Column("phone", db.String(20)),
+    db.Column("bio", db.Text),
+    db.Column("profile_picture_url", db.String(500)),
+    db.Column("address", db.String(255)),
+    db.Column("city", db.String(100)),
+    db.Column("state", db.String(100)),
+    db.Column("country", db.String(100)),
+)
+
+_courses_v1 = db.Table(
+    "courses",
+    _frozen,
+    db.Column("id", db.Integer, primary_key=True),
+    db.Column("title", db.String(150), nullable=False),
+    db.Column("description", db.Text),
+    db.Column(
+        "instructor_id",
+        db.Integer,
+        db.ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    db.Column("credits", db.Integer),
+    db.Column("capacity", db.Integer),
+    db.Column("created_at", db.DateTime),
+    db.Column("updated_at", db.DateTime),
+)
+
+_enrollments_v1 = db.Table(
+    "enrollments",
+    _frozen,
+    db.Column("id", db.Integer, primary_key=True),
+    db.Column(
+        "student_id",
+        db.Integer,
+        db.ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    db.Column(
+        "course_id",
+        db.Integer,
+        db.ForeignKey("courses.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    db.Column("status", db.String(20), nullable=False),
+    db.Column("created_at", db.DateTime),
+    db.Column("updated_at", db.DateTime),
+    db.UniqueConstraint("student_id", "course_id", name="unique_enrollment"),
+)
+
+_audit_log_v1 = db.Table(
+    "audit_log",
+    _frozen,
+    db.Column("id", db.Integer, primary_key=True),
+    db.Column("user_id", db.Integer, db.ForeignKey("users.id", ondelete="SET NULL")),
+    db.Column("action", db.String(255), nullable=False),
+    db.Column("timestamp", db.DateTime),
+)
+
+_revoked_tokens_v5 = db.Table(
+    "revoked_tokens",
+    _frozen,
+    db.Column("id", db.Integer, primary_key=True),
+    db.Column("jti", db.String(36), unique=True, nullable=False),
+    db.Column("user_id", db.Integer, db.ForeignKey("users.id", ondelete="CASCADE")),
+    db.Column("expires_at", db.DateTime, nullable=False),
+    db.Column("revoked_at", db.DateTime),
+    db.Index("idx_revoked_expires", "expires_at"),
+)
+
+# (table, index name, columns) from schema.sql, added by migration 3
+SECONDARY_INDEXES = (
+    ("courses", "idx_instructor", "instructor_id"),
+    ("courses", "idx_courses_title", "title"),
+    ("enrollments", "idx_course_status", "course_id, status"),
+    ("enrollments", "idx_status", "status"),
+    ("enrollments", "idx_enrollments_created", "created_at"),
+    ("audit_log", "idx_user", "user_id"),
+    ("audit_log", "idx_timestamp", "timestamp"),
+)
+
+
+# ============ MIGRATIONS ============
+
+
+@migration(1, "Create base tables")
+def create_base_tables(connection):
+    _frozen.create_all(
+        connection, tables=[_users_v1, _courses_v1, _enrollments_v1, _audit_log_v1]
+    )
+
+
+@migration(2, "Add courses.enrolled_count")
+def add_enrolled_count(connection):
+    columns = {c["name"] for c in inspect(connection).get_columns("courses")}
+    if "enrolled_count" not in columns:
+        connection.execute(
+            text(
+                "ALTER TABLE courses "
+                "ADD COLUMN enrolled_count INTEGER NOT NULL DEFAULT 0"
+            )
+        )
+    connection.execute(
+        text(
+            "UPDATE courses SET enrolled_count = ("
+            "SELECT COUNT(*) FROM enrollments "
+            "WHERE enrollments.course_id = courses.id "
+            "AND enrollments.status = 'enrolled')"
+        )
+    )
+
+
+@migration(3, "Add secondary indexes from schema.sql")
+def add_secondary_indexes(connection):
+    inspector = inspect(connection)
+    existing = {
+        index["name"]
+        for table in {table for table, _, _ in SECONDARY_INDEXES}
+        for index in inspector.get_indexes(table)
+    }
+    for table, name, columns in SECONDARY_INDEXES:
+        if name not in existing:
+            connection.execute(text(f"CREATE INDEX {name} ON {table} ({columns})"))
+
+
+COURSES_FTS_DDL = (
+    "CREATE VIRTUAL TABLE courses_fts USING fts5("
+    "title, description, content='courses', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    # Rank title hits ten times higher than description hits
+    "INSERT INTO courses_fts(courses_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+    "CREATE TRIGGER courses_fts_ai AFTER INSERT ON courses BEGIN "
+    "INSERT INTO courses_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER courses_fts_ad AFTER DELETE ON courses BEGIN "
+    "INSERT INTO courses_fts(courses_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    # Counter updates leave title and description alone and skip this trigger
+    "CREATE TRIGGER courses_fts_au AFTER UPDATE OF title, description ON courses "
+    "BEGIN "
+    "INSERT INTO courses_fts(courses_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO courses_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "INSERT INTO courses_fts(courses_fts) VALUES ('rebuild')",
+)
+
+
+@migration(4, "Add courses_fts full-text search index")
+def add_course_search_index(connection):
+    if connection.dialect.name != "sqlite":
+        # Course search falls back to LIKE matching on other databases
+        return
+    for statement in COURSES_FTS_DDL:
+        connection.execute(text(statement))
+
+
+@migration(5, "Create revoked_tokens")
+def create_revoked_tokens(connection):
+    _frozen.create_all(connection, tables=[_revoked_tokens_v5])
+
+
+@migration(6, "Rebuild idx_courses_title with NOCASE on SQLite")
+def nocase_course_title_index(connection):
+    # SQLite's LIKE is case-insensitive, so only a NOCASE index can serve the
+    # title_prefix filter; MySQL's _ci collation already uses the plain one
+    if connection.dialect.name != "sqlite":
+        return
+    connection.execute(text("DROP INDEX IF EXISTS idx_courses_title"))
+    connection.execute(
+        text("CREATE INDEX idx_courses_title ON courses(title COLLATE NOCASE)")
+    )
+
+
+# ============ RUNNER ============
+
+
+def current_version(connection):
+    if not inspect(connection).has_table(SCHEMA_VERSION_TABLE):
+        return 0
+    version = connection.execute(
+        db.select(db.func.max(schema_version.c.version))
+    ).scalar()
+    return version or 0
+
+
+def pending_migrations(connection):
+    version = current_version(connection)
+    return [m for m in sorted(MIGRATIONS, key=lambda m: m[0]) if m[0] > version]
+
+
+def upgrade(engine):
+    """Apply every pending migration, each in its own transaction.
+
+    Returns the list of (version, description) pairs that were applied.
+    """
+    with engine.begin() as connection:
+        schema_version.create(connection, checkfirst=True)
+        pending = pending_migrations(connection)
+
+    applied = []
+    for version, description, fn in pending:
+        with engine.begin() as connection:
+            fn(connection)
+            connection.execute(
+                schema_version.insert().values(
+                    version=version,
+                    description=description,
+                    applied_at=datetime.utcnow(),
+                )
+            )
+        applied.append((version, description))
+    return applied
+
+
+def check_schema(engine):
+    """Compare the live schema with the models and return a list of problems"""
+    problems = []
+    with engine.connect() as connection:
+        inspector = inspect(connection)
+        pending = pending_migrations(connection)
+        if pending:
+            problems.append(
+                f"{len(pending)} pending migration(s), latest is {pending[-1][0]}"
+            )
+
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                problems.append(f"Missing table {table.name}")
+                continue
+
+            live_columns = {c["name"] for c in inspector.get_columns(table.name)}
+            model_columns = {column.name for column in table.columns}
+            for name in sorted(model_columns - live_columns):
+                problems.append(f"Missing column {table.name}.{name}")
+            for name in sorted(live_columns - model_columns):
+                problems.append(f"Unmapped column {table.name}.{name}")
+
+            live_indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in live_indexes:
+                    problems.append(f"Missing index {index.name} on {table.name}")
+    return problems
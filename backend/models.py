@@ -77,6 +77,10 @@ class Course(db.Model):
     )
     credits = db.Column(db.Integer, default=3)
     capacity = db.Column(db.Integer, default=30)
+    # Denormalized count of "enrolled" rows, maintained by the enrollment routes
+    enrolled_count = db.Column(
+        db.Integer, default=0, server_default="0", nullable=False
+    )
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -87,6 +91,12 @@ class Course(db.Model):
         "Enrollment", backref="course", lazy=True, cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        db.Index("idx_instructor", "instructor_id"),
+        # NOCASE on SQLite (migration 6) so title_prefix LIKE can use it
+        db.Index("idx_courses_title", "title"),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -96,13 +106,31 @@ class Course(db.Model):
             "instructor": self.instructor.username if self.instructor else None,
             "credits": self.credits,
             "capacity": self.capacity,
-            "enrolled_count": len(
-                [e for e in self.enrollments if e.status == "enrolled"]
-            ),
+            "enrolled_count": self.enrolled_count,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
         }
 
+    @classmethod
+    def listing_query(cls):
+        """Select course rows with instructor name and enrolled count in one query."""
+        return (
+            db.select(
+                cls.id,
+                cls.title,
+                cls.description,
+                cls.instructor_id,
+                User.username.label("instructor"),
+                cls.credits,
+                cls.capacity,
+                cls.enrolled_count,
+                cls.created_at,
+                cls.updated_at,
+            )
+            .outerjoin(User, User.id == cls.instructor_id)
+            .order_by(cls.id)
+        )
+
 
 class Enrollment(db.Model):
     __tablename__ = "enrollments"
@@ -122,21 +150,30 @@ class Enrollment(db.Model):
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    # unique_enrollment also serves student_id lookups, and idx_course_status
+    # serves course_id lookups, so neither column needs an index of its own
     __table_args__ = (
         db.UniqueConstraint("student_id", "course_id", name="unique_enrollment"),
+        db.Index("idx_course_status", "course_id", "status"),
+        db.Index("idx_status", "status"),
+        db.Index("idx_enrollments_created", "created_at"),
     )
 
-    def to_dict(self):
-        return {
+    def to_dict(self, include_course=True):
+        data = {
             "id": self.id,
             "student_id": self.student_id,
             "course_id": self.course_id,
-            "course": self.course.to_dict() if self.course else None,
             "status": self.status,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
         }
 
+        if include_course:
+            data["course"] = self.course.to_dict() if self.course else None
+
+        return data
+
 
 class AuditLog(db.Model):
     __tablename__ = "audit_log"
@@ -146,6 +183,11 @@ class AuditLog(db.Model):
     action = db.Column(db.String(255), nullable=False)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index("idx_user", "user_id"),
+        db.Index("idx_timestamp", "timestamp"),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -153,3 +195,37 @@ class AuditLog(db.Model):
             "action": self.action,
             "timestamp": self.timestamp.isoformat(),
         }
+
+
+class RevokedToken(db.Model):
+    """A JWT revoked before its expiry, kept until that expiry passes."""
+
+    __tablename__ = "revoked_tokens"
+
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), unique=True, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"))
+    expires_at = db.Column(db.DateTime, nullable=False)
+    revoked_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (db.Index("idx_revoked_expires", "expires_at"),)
+
+
+def reconcile_enrolled_counts():
+    """Reset Course.enrolled_count wherever it drifted from the enrollments table.
+
+    Returns the number of courses that were repaired.
+    """
+    actual = (
+        db.select(db.func.count(Enrollment.id))
+        .where(Enrollment.course_id == Course.id, Enrollment.status == "enrolled")
+        .scalar_subquery()
+    )
+    result = db.session.execute(
+        db.update(Course)
+        .where(Course.enrolled_count != actual)
+        .values(enrolled_count=actual)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
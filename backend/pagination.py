@@ -0,0 +1,116 @@
+"""Keyset pagination and sparse fieldset helpers for list endpoints"""
+
+import base64
+import json
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int):
+    """Encode the id of the last row on a page as an opaque cursor"""
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Decode a cursor produced by encode_cursor and return the row id"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(last_id, int):
+        raise ValueError("Invalid cursor")
+    return last_id
+
+
+def parse_page_args(args):
+    """Return (limit, after_id) from query args.
+
+    Pagination is opt-in: without `limit` or `cursor` the limit is None and
+    callers return the full list as before.
+    """
+    limit = args.get("limit")
+    cursor = args.get("cursor")
+
+    if limit is None and cursor is None:
+        return None, None
+
+    if limit is None:
+        limit = DEFAULT_PAGE_LIMIT
+    else:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError("limit must be an integer")
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        limit = min(limit, MAX_PAGE_LIMIT)
+
+    after_id = decode_cursor(cursor) if cursor else None
+    return limit, after_id
+
+
+def parse_after_id(args):
+    """Return the keyset position from `after_id` or `cursor`, if any.
+
+    Streams accept a raw `after_id` (the last id received) so an interrupted
+    download can resume without decoding a cursor.
+    """
+    after_id = args.get("after_id")
+    if after_id is not None:
+        try:
+            return int(after_id)
+        except ValueError:
+            raise ValueError("after_id must be an integer")
+    cursor = args.get("cursor")
+    return decode_cursor(cursor) if cursor else None
+
+
+def paginate(query, id_column, limit, after_id, descending=False):
+    """Apply keyset ordering and limits to a select() or legacy Query.
+
+    With descending=True pages run newest first and the cursor marks the
+    lowest id already returned.
+    """
+    if descending:
+        query = query.order_by(None).order_by(id_column.desc())
+        if after_id is not None:
+            query = query.where(id_column < after_id)
+    else:
+        query = query.order_by(None).order_by(id_column)
+        if after_id is not None:
+            query = query.where(id_column > after_id)
+    if limit is not None:
+        # Fetch one extra row to know whether another page exists
+        query = query.limit(limit + 1)
+    return query
+
+
+def split_page(rows, limit, id_getter=lambda row: row.id):
+    """Trim the look-ahead row and return (rows, next_cursor)"""
+    rows = list(rows)
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(id_getter(rows[-1]))
+
+
+def parse_fields(args, allowed):
+    """Return the requested `fields=` list, or None for all fields"""
+    fields = args.get("fields")
+    if not fields:
+        return None
+
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
+
+def escape_like(value: str):
+    """Escape LIKE wildcards so user input is matched literally"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
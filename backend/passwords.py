@@ -0,0 +1,159 @@
+"""Password hashing with a configurable method on a bounded worker pool.
+
+PBKDF2 and scrypt run in hashlib with the GIL released, so a small thread
+pool takes hashing off the request threads without starving cheap
+requests. When every slot is busy, callers get PasswordHasherBusy at once
+instead of queueing behind the login storm.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import partial
+from flask import current_app
+from forksafe import PerProcessWorker
+from werkzeug.security import (
+    DEFAULT_PBKDF2_ITERATIONS,
+    check_password_hash,
+    generate_password_hash,
+)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool has no free slot for another request."""
+
+
+def normalize_method(method):
+    """Spell out Werkzeug's defaults, e.g. "pbkdf2" -> "pbkdf2:sha256:600000"."""
+    name, *args = method.split(":")
+    if name == "pbkdf2":
+        hash_name = args[0] if args else "sha256"
+        iterations = args[1] if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{iterations}"
+    if name == "scrypt" and not args:
+        return "scrypt:32768:8:1"
+    return method
+
+
+def hash_function(config):
+    """Picklable password -> hash callable for the configured method"""
+    return partial(
+        generate_password_hash,
+        method=config["PASSWORD_HASH_METHOD"],
+        salt_length=config["PASSWORD_SALT_LENGTH"],
+    )
+
+
+class PasswordHasher(PerProcessWorker):
+    """Hash and verify passwords on a bounded thread pool, with timing stats."""
+
+    def __init__(self, app=None):
+        self._stats_lock = threading.Lock()
+        self._counters = {
+            "hashes": 0,
+            "verifications": 0,
+            "rejected_busy": 0,
+            "rehashed": 0,
+            "hash_seconds_total": 0.0,
+            "hash_seconds_max": 0.0,
+            "queue_wait_seconds_total": 0.0,
+            "queue_wait_seconds_max": 0.0,
+        }
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("PASSWORD_HASH_METHOD", "pbkdf2:sha256")
+        app.config.setdefault("PASSWORD_SALT_LENGTH", 16)
+        app.config.setdefault("PASSWORD_HASH_WORKERS", os.cpu_count() or 1)
+        # Requests allowed to wait for a worker before new ones get a 503
+        app.config.setdefault("PASSWORD_HASH_QUEUE_SIZE", 32)
+        app.config.setdefault("PASSWORD_HASH_TIMEOUT", 10.0)
+
+        self.method = normalize_method(app.config["PASSWORD_HASH_METHOD"])
+        self._hash = hash_function(app.config)
+        self.workers = app.config["PASSWORD_HASH_WORKERS"]
+        self.timeout = app.config["PASSWORD_HASH_TIMEOUT"]
+        self._slots = threading.BoundedSemaphore(
+            self.workers + app.config["PASSWORD_HASH_QUEUE_SIZE"]
+        )
+        app.extensions["password_hasher"] = self
+
+    def hash(self, password):
+        """Hash `password` with the configured method"""
+        result = self._run(self._hash, password)
+        self._count("hashes")
+        return result
+
+    def verify(self, password_hash, password):
+        """Return (matches, needs_rehash) for a stored hash"""
+        matches = self._run(check_password_hash, password_hash, password)
+        self._count("verifications")
+        return matches, matches and self.needs_rehash(password_hash)
+
+    def needs_rehash(self, password_hash):
+        return normalize_method(password_hash.split("$", 1)[0]) != self.method
+
+    def record_rehash(self):
+        self._count("rehashed")
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._counters)
+        stats["workers"] = self.workers
+        stats["method"] = self.method
+        return stats
+
+    def _start_worker(self):
+        return ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="password-hash"
+        )
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected_busy")
+            raise PasswordHasherBusy()
+
+        submitted = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                finished = time.perf_counter()
+                self._slots.release()
+                self._observe("queue_wait_seconds", started - submitted)
+                self._observe("hash_seconds", finished - started)
+
+        try:
+            future = self._ensure_worker().submit(task)
+        except RuntimeError:
+            self._slots.release()
+            raise
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # The task keeps its slot until it finishes
+            raise PasswordHasherBusy()
+
+    def _observe(self, name, seconds):
+        with self._stats_lock:
+            self._counters[f"{name}_total"] += seconds
+            if seconds > self._counters[f"{name}_max"]:
+                self._counters[f"{name}_max"] = seconds
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._counters[name] += amount
+
+
+def get_password_hasher():
+    return current_app.extensions["password_hasher"]
+
+
+def hash_password(password):
+    """Hash a password through the current app's PasswordHasher."""
+    return get_password_hasher().hash(password)
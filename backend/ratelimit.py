@@ -0,0 +1,287 @@
+"""Admission control for expensive endpoints: token buckets and concurrency caps.
+
+Routes decorated with @rate_limited are checked in two steps:
+
+    1. Token buckets from RATE_LIMITS[endpoint], one per (scope, rate, burst)
+       rule. Scopes: "ip" (client address), "user" (authenticated user id,
+       else the client address) and "route" (one bucket for everyone).
+    2. A per-process cap on requests in flight from
+       CONCURRENCY_LIMITS[endpoint], so a flood of logins cannot occupy
+       every worker thread while other routes wait behind it.
+
+Either refusal is an immediate 429 with Retry-After rather than a request
+queued until it times out. Buckets live in this process (memory) or, with
+RATE_LIMIT_BACKEND=shared, in `flask cache-server` so all workers draw
+from the same ones.
+"""
+
+import math
+import threading
+import time
+from functools import wraps
+from flask import current_app, jsonify, request
+from cache import cache_manager, parse_address
+
+# endpoint -> ((scope, tokens per second, burst), ...)
+DEFAULT_RATE_LIMITS = {
+    # Generous per IP: a campus NAT puts many students behind one address
+    "auth.login": (("ip", 1.0, 30), ("route", 50.0, 200)),
+    "auth.register": (("ip", 0.2, 10),),
+    "auth.refresh": (("ip", 2.0, 60),),
+    "enrollments.enroll_in_course": (("user", 0.5, 10), ("route", 100.0, 300)),
+    "enrollments.bulk_enroll_endpoint": (("user", 0.1, 3),),
+}
+# endpoint -> requests in flight per worker process
+DEFAULT_CONCURRENCY_LIMITS = {
+    "auth.login": 2,
+    "auth.register": 2,
+    "enrollments.enroll_in_course": 3,
+}
+SCOPES = ("ip", "user", "route")
+# Retry-After for requests shed by a concurrency cap
+SHED_RETRY_AFTER = 1
+# Seconds between sweeps that drop refilled buckets
+PRUNE_INTERVAL = 60.0
+
+
+class TokenBuckets:
+    """Thread-safe token buckets keyed by string, created full on first use.
+
+    A bucket that has refilled is indistinguishable from a missing one, so
+    periodic sweeps drop those and memory only holds recently active keys.
+    """
+
+    def __init__(self):
+        self._buckets = {}  # key -> (tokens, updated_at, full_at)
+        self._lock = threading.Lock()
+        self._pruned_at = time.monotonic()
+
+    def take(self, key, rate, burst):
+        """Take one token; returns 0 or the seconds until one is available"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens = burst
+            else:
+                tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+            if not wait:
+                tokens -= 1
+            self._buckets[key] = (tokens, now, now + (burst - tokens) / rate)
+            if now - self._pruned_at >= PRUNE_INTERVAL:
+                self._prune(now)
+        return wait
+
+    def size(self):
+        with self._lock:
+            return len(self._buckets)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+    def _prune(self, now):
+        self._pruned_at = now
+        for key in [k for k, bucket in self._buckets.items() if bucket[2] <= now]:
+            del self._buckets[key]
+
+
+class SharedTokenBuckets:
+    """Client for the TokenBuckets hosted by `flask cache-server`.
+
+    Failing open: if the server is unreachable the request is admitted and
+    the error counted, since the concurrency caps still protect the worker.
+    """
+
+    def __init__(self, address, authkey):
+        self.address = address
+        self.authkey = authkey
+        self.errors = 0
+        self._remote = None
+        self._lock = threading.Lock()
+
+    def _buckets(self):
+        if self._remote is None:
+            with self._lock:
+                if self._remote is None:
+                    CacheManager = cache_manager()
+                    CacheManager.register("get_rate_limits")
+                    manager = CacheManager(
+                        address=self.address, authkey=self.authkey
+                    )
+                    manager.connect()
+                    self._remote = manager.get_rate_limits()
+        return self._remote
+
+    def take(self, key, rate, burst):
+        try:
+            return self._buckets().take(key, rate, burst)
+        except (OSError, EOFError):
+            self.errors += 1
+            self._remote = None
+            current_app.logger.warning(
+                "Shared rate limits at %s unavailable", self.address
+            )
+            return 0.0
+
+    def size(self):
+        try:
+            return self._buckets().size()
+        except (OSError, EOFError):
+            return 0
+
+    def clear(self):
+        try:
+            self._buckets().clear()
+        except (OSError, EOFError):
+            pass
+
+
+class ConcurrencyLimit:
+    """Non-blocking cap on requests in flight in this process."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_flight = 0
+        self.peak = 0
+        self.shed = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        with self._lock:
+            if self.in_flight >= self.limit:
+                self.shed += 1
+                return False
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            return True
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+
+
+def _metric_name(endpoint):
+    return endpoint.replace(".", "_")
+
+
+class RateLimiter:
+    """Applies RATE_LIMITS and CONCURRENCY_LIMITS to @rate_limited routes."""
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._counters = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("RATE_LIMIT_ENABLED", True)
+        app.config.setdefault("RATE_LIMIT_BACKEND", "memory")  # or "shared"
+        app.config.setdefault("RATE_LIMITS", DEFAULT_RATE_LIMITS)
+        app.config.setdefault("CONCURRENCY_LIMITS", DEFAULT_CONCURRENCY_LIMITS)
+
+        self.enabled = app.config["RATE_LIMIT_ENABLED"]
+        self.backend = app.config["RATE_LIMIT_BACKEND"]
+        self.rules = {}
+        for endpoint, rules in app.config["RATE_LIMITS"].items():
+            for scope, rate, burst in rules:
+                if scope not in SCOPES:
+                    raise ValueError(f"Unknown rate limit scope {scope!r}")
+                if rate <= 0 or burst < 1:
+                    raise ValueError(f"Invalid rate limit for {endpoint}")
+            self.rules[endpoint] = tuple(rules)
+        self.concurrency = {
+            endpoint: ConcurrencyLimit(limit)
+            for endpoint, limit in app.config["CONCURRENCY_LIMITS"].items()
+        }
+
+        if self.backend == "shared":
+            # The buckets are hosted by the response cache server
+            self.buckets = SharedTokenBuckets(
+                parse_address(app.config["RESPONSE_CACHE_ADDRESS"]),
+                app.config["RESPONSE_CACHE_AUTHKEY"].encode(),
+            )
+        else:
+            self.buckets = TokenBuckets()
+        app.extensions["rate_limiter"] = self
+
+    def check_rate(self, endpoint):
+        """Seconds the caller must wait before retrying, or 0 if admitted"""
+        name = _metric_name(endpoint)
+        for scope, rate, burst in self.rules.get(endpoint, ()):
+            key = f"{endpoint}:{scope}:{_client_key(scope)}"
+            wait = self.buckets.take(key, rate, burst)
+            self._count(f"{name}_{scope}_{'limited' if wait else 'allowed'}")
+            # Stop at the first refusal so it does not drain the other buckets
+            if wait:
+                return wait
+        return 0.0
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        for endpoint, limit in self.concurrency.items():
+            name = _metric_name(endpoint)
+            stats[f"{name}_in_flight"] = limit.in_flight
+            stats[f"{name}_in_flight_peak"] = limit.peak
+            stats[f"{name}_in_flight_limit"] = limit.limit
+            stats[f"{name}_shed"] = limit.shed
+        stats["buckets"] = self.buckets.size()
+        stats["backend"] = self.backend
+        if self.backend == "shared":
+            stats["errors"] = self.buckets.errors
+        return stats
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + 1
+
+
+def _client_key(scope):
+    if scope == "route":
+        return ""
+    if scope == "user" and getattr(request, "user_id", None) is not None:
+        return f"user:{request.user_id}"
+    # Behind a proxy this needs PROXY_FIX_X_FOR, or every client shares one key
+    return f"ip:{request.remote_addr}"
+
+
+def _too_many_requests(message, retry_after):
+    response = jsonify({"error": message})
+    response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response, 429
+
+
+def get_rate_limiter():
+    return current_app.extensions["rate_limiter"]
+
+
+def rate_limited(f):
+    """Decorator admitting a request through its endpoint's limits.
+
+    Place it below @token_required so "user" rules see the user id.
+    """
+
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        limiter = get_rate_limiter()
+        if not limiter.enabled:
+            return f(*args, **kwargs)
+
+        endpoint = request.endpoint
+        wait = limiter.check_rate(endpoint)
+        if wait:
+            return _too_many_requests("Too many requests, retry later", wait)
+
+        slot = limiter.concurrency.get(endpoint)
+        if slot is None:
+            return f(*args, **kwargs)
+        if not slot.try_acquire():
+            return _too_many_requests("Server busy, retry shortly", SHED_RETRY_AFTER)
+        try:
+            return f(*args, **kwargs)
+        finally:
+            slot.release()
+
+    return decorated
@@ -0,0 +1,188 @@
+"""Revocation of JWTs before they expire.
+
+Revoked token ids (the `jti` claim) are stored in the revoked_tokens
+table and mirrored into a dict in every worker process, so checking a
+token costs one hash lookup. A background thread pulls revocations made
+by other processes every REVOCATION_SYNC_INTERVAL seconds and drops
+entries whose token has expired anyway, so memory only holds revocations
+that can still matter.
+
+Revocation is therefore eventually consistent across processes: after a
+logout, other workers accept the revoked access token until their next
+sync, up to REVOCATION_SYNC_INTERVAL seconds later. Refresh tokens have
+no such window, since exchanging one inserts its jti and a second
+exchange fails on the table's unique key in whichever process it runs.
+"""
+
+import heapq
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from forksafe import PerProcessWorker
+from models import db, RevokedToken
+
+# Re-read this much revoked_at history on each sync, so rows committed
+# slightly out of order by concurrent writers are not missed
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+def _utc_datetime(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+def _timestamp(value):
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class RevocationStore(PerProcessWorker):
+    """Revoked token ids, persisted to revoked_tokens and cached in memory."""
+
+    def __init__(self, app=None):
+        self.app = None
+        self._revoked = {}  # jti -> expiry timestamp
+        self._expiries = []  # heap of (expiry timestamp, jti) for pruning
+        self._synced_at = None
+        self._purged_at = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._counters = {
+            "revoked": 0,
+            "rejected": 0,
+            "syncs": 0,
+            "sync_failures": 0,
+            "pruned": 0,
+        }
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("REVOCATION_SYNC_INTERVAL", 5.0)
+        # How often each process deletes expired rows from revoked_tokens
+        app.config.setdefault("REVOCATION_PURGE_INTERVAL", 3600.0)
+
+        self.app = app
+        self.sync_interval = app.config["REVOCATION_SYNC_INTERVAL"]
+        self.purge_interval = app.config["REVOCATION_PURGE_INTERVAL"]
+        app.extensions["token_revocation"] = self
+
+    def revoke(self, jti, user_id, expires):
+        """Revoke token `jti` until `expires` (a Unix timestamp).
+
+        Returns False if it was already revoked, here or in another
+        process, so a refresh token can be exchanged only once.
+        """
+        row = {
+            "jti": jti,
+            "user_id": user_id,
+            "expires_at": _utc_datetime(expires),
+            "revoked_at": datetime.utcnow(),
+        }
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(RevokedToken.__table__.insert(), row)
+        except IntegrityError:
+            inserted = False
+        else:
+            inserted = True
+            self._count("revoked")
+        with self._lock:
+            self._add(jti, expires)
+        return inserted
+
+    def is_revoked(self, jti):
+        self._ensure_worker()
+        if jti in self._revoked:
+            self._count("rejected")
+            return True
+        return False
+
+    def sync(self):
+        """Load revocations recorded since the last sync and prune expired ones"""
+        started = datetime.utcnow()
+        query = db.select(RevokedToken.jti, RevokedToken.expires_at).where(
+            RevokedToken.expires_at > started
+        )
+        if self._synced_at is not None:
+            since = self._synced_at - SYNC_OVERLAP
+            query = query.where(RevokedToken.revoked_at >= since)
+
+        try:
+            with self.app.app_context():
+                with db.engine.connect() as connection:
+                    rows = connection.execute(query).all()
+        except Exception:
+            self._count("sync_failures")
+            self.app.logger.exception("Failed to sync revoked tokens")
+            return
+
+        with self._lock:
+            for jti, expires_at in rows:
+                self._add(jti, _timestamp(expires_at))
+            self._prune(time.time())
+        self._synced_at = started
+        self._count("syncs")
+
+    def purge_expired(self):
+        """Delete rows for tokens that have expired; returns how many"""
+        with self.app.app_context():
+            with db.engine.begin() as connection:
+                result = connection.execute(
+                    RevokedToken.__table__.delete().where(
+                        RevokedToken.expires_at <= datetime.utcnow()
+                    )
+                )
+        return result.rowcount
+
+    def close(self, timeout=5.0):
+        self._stop.set()
+        thread = self._detach_worker()
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["size"] = len(self._revoked)
+        return stats
+
+    def _add(self, jti, expires):
+        if jti not in self._revoked:
+            self._revoked[jti] = expires
+            heapq.heappush(self._expiries, (expires, jti))
+
+    def _prune(self, now):
+        while self._expiries and self._expiries[0][0] <= now:
+            _, jti = heapq.heappop(self._expiries)
+            del self._revoked[jti]
+            self._counters["pruned"] += 1
+
+    def _start_worker(self):
+        self._stop = threading.Event()
+        # Load everything before the first check rather than a sync later
+        self._synced_at = None
+        self.sync()
+        thread = threading.Thread(
+            target=self._run, name="token-revocation", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _run(self):
+        while not self._stop.wait(self.sync_interval):
+            self.sync()
+            if time.monotonic() - self._purged_at >= self.purge_interval:
+                self._purged_at = time.monotonic()
+                try:
+                    self.purge_expired()
+                except Exception:
+                    self.app.logger.exception("Failed to purge revoked tokens")
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+
+def get_revocation_store():
+    return current_app.extensions["token_revocation"]
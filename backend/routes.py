@@ -1,7 +1,32 @@
 # backend/routes.py
-from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import Blueprint, Response, current_app, request, jsonify, send_file
+from sqlalchemy.exc import IntegrityError
 from models import db, User, Course, Enrollment, AuditLog
+from audit import record_audit
+from bulk import (
+    DEFAULT_CHUNK_SIZE,
+    bulk_create_users,
+    bulk_enroll,
+    detect_format,
+    iter_records,
+    publish_seat_counts,
+)
+from cache import course_key, course_list_key, get_cache, invalidate_course
+from database import engine_stats
+from events import (
+    get_seat_events,
+    parse_last_event_id,
+    publish_course_deleted,
+    publish_seats,
+)
+from http_cache import (
+    add_validators,
+    make_etag,
+    not_modified,
+    not_modified_response,
+)
+from passwords import PasswordHasherBusy, get_password_hasher, hash_password
+from blobstore import BlobTooLarge, decode_data_url, get_blobstore, media_url
 from jwt_auth import (
     token_required,
     admin_required,
@@ -9,19 +34,116 @@ from jwt_auth import (
     create_refresh_token,
     get_current_user,
     role_required,
+    verify_token,
+)
+from ratelimit import get_rate_limiter, rate_limited
+from revocation import get_revocation_store
+from pagination import (
+    DEFAULT_PAGE_LIMIT,
+    NEXT_CURSOR_HEADER,
+    encode_cursor,
+    escape_like,
+    paginate,
+    parse_after_id,
+    parse_fields,
+    parse_page_args,
+    split_page,
 )
-from datetime import datetime
+from search import search_query, search_terms
+from waitlist import promote_waitlist, waitlist_position
+from serializers import (
+    AUDIT_SCHEMA,
+    COURSE_SCHEMA,
+    ENROLLMENT_SCHEMA,
+    USER_SCHEMA,
+    dumps,
+    enrollment_encoder,
+    enrollments_with_course_query,
+    json_response,
+)
+from streaming import (
+    STREAM_YIELD_PER,
+    encode_rows,
+    parse_export_format,
+    streaming_response,
+)
+from datetime import datetime, timezone
 
 # Create blueprints
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 courses_bp = Blueprint("courses", __name__, url_prefix="/courses")
 enrollments_bp = Blueprint("enrollments", __name__, url_prefix="/enrollments")
 users_bp = Blueprint("users", __name__, url_prefix="/users")
+admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
+media_bp = Blueprint("media", __name__, url_prefix="/media")
+
+# Fields accepted by the `fields=` parameter of list endpoints
+COURSE_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "instructor_id",
+    "instructor",
+    "credits",
+    "capacity",
+    "enrolled_count",
+    "created_at",
+    "updated_at",
+)
+USER_FIELDS = ("id", "username", "email", "role", "created_at", "updated_at")
+ENROLLMENT_FIELDS = (
+    "id",
+    "student_id",
+    "course_id",
+    "course",
+    "status",
+    "created_at",
+    "updated_at",
+)
+AUDIT_FIELDS = ("id", "user_id", "action", "timestamp")
+
+# Columns streamed by /admin/export/<table>
+USER_EXPORT_FIELDS = USER_FIELDS + (
+    "full_name",
+    "phone",
+    "bio",
+    "address",
+    "city",
+    "state",
+    "country",
+)
+ENROLLMENT_EXPORT_FIELDS = tuple(f for f in ENROLLMENT_FIELDS if f != "course")
+EXPORTS = {
+    "users": (User, USER_EXPORT_FIELDS),
+    "courses": (Course, COURSE_FIELDS),
+    "enrollments": (Enrollment, ENROLLMENT_EXPORT_FIELDS),
+}
 
 # ============ AUTH ROUTES ============
 
 
+def _hasher_busy_response():
+    response = jsonify({"error": "Too many logins in progress, retry shortly"})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
+
+def _set_auth_cookies(response, user):
+    """Issue a new access/refresh token pair for `user` as cookies"""
+    access_token = create_access_token(user.id, user.username, user.role)
+    refresh_token = create_refresh_token(user.id)
+
+    # Note: Secure=False for localhost development. Set to True in production!
+    response.set_cookie(
+        "access_token", access_token, httponly=True, samesite="Lax", secure=False, max_age=24*60*60
+    )
+    response.set_cookie(
+        "refresh_token", refresh_token, httponly=True, samesite="Lax", secure=False, max_age=30*24*60*60
+    )
+
+
 @auth_bp.route("/register", methods=["POST"])
+@rate_limited
 def register():
     """Register a new user."""
     data = request.get_json()
@@ -40,10 +162,15 @@ def register():
     if User.query.filter_by(email=data["email"]).first():
         return jsonify({"error": "Email already exists"}), 409
 
+    try:
+        password_hash = hash_password(data["password"])
+    except PasswordHasherBusy:
+        return _hasher_busy_response()
+
     user = User(
         username=data["username"],
         email=data["email"],
-        password_hash=generate_password_hash(data["password"]),
+        password_hash=password_hash,
         role=data.get("role", "student"),
     )
 
@@ -51,31 +178,20 @@ def register():
     db.session.commit()
 
     # Log action
-    log = AuditLog(user_id=user.id, action=f"User registered: {user.username}")
-    db.session.add(log)
-    db.session.commit()
-
-    # Auto-login after registration by setting cookies
-    access_token = create_access_token(user.id, user.username, user.role)
-    refresh_token = create_refresh_token(user.id)
+    record_audit(user.id, f"User registered: {user.username}")
 
     response = jsonify({
         "message": "User registered and logged in successfully", 
         "user": user.to_dict()
     })
     
-    # Set cookies
-    response.set_cookie(
-        "access_token", access_token, httponly=True, samesite="Lax", secure=False, max_age=24*60*60
-    )
-    response.set_cookie(
-        "refresh_token", refresh_token, httponly=True, samesite="Lax", secure=False, max_age=30*24*60*60
-    )
-
+    # Auto-login after registration by setting cookies
+    _set_auth_cookies(response, user)
     return response, 201
 
 
 @auth_bp.route("/login", methods=["POST"])
+@rate_limited
 def login():
     """Login a user and return JWT tokens."""
     data = request.get_json()
@@ -85,17 +201,32 @@ def login():
 
     user = User.query.filter_by(username=data["username"]).first()
 
-    if not user or not check_password_hash(user.password_hash, data["password"]):
+    hasher = get_password_hasher()
+    try:
+        matches, needs_rehash = (
+            hasher.verify(user.password_hash, data["password"])
+            if user
+            else (False, False)
+        )
+    except PasswordHasherBusy:
+        return _hasher_busy_response()
+
+    if not matches:
         return jsonify({"error": "Invalid username or password"}), 401
 
-    # Create tokens
-    access_token = create_access_token(user.id, user.username, user.role)
-    refresh_token = create_refresh_token(user.id)
+    if needs_rehash:
+        # The hash method changed since this password was stored; upgrade it
+        # now that the plaintext is known. A busy pool retries on a later login.
+        try:
+            user.password_hash = hasher.hash(data["password"])
+        except PasswordHasherBusy:
+            pass
+        else:
+            db.session.commit()
+            hasher.record_rehash()
 
     # Log action
-    log = AuditLog(user_id=user.id, action=f"User logged in: {user.username}")
-    db.session.add(log)
-    db.session.commit()
+    record_audit(user.id, f"User logged in: {user.username}")
 
     response = jsonify(
         {
@@ -103,30 +234,66 @@ def login():
             "user": user.to_dict(),
         }
     )
-    
-    # Set cookies
-    # Note: Secure=False for localhost development. Set to True in production!
-    response.set_cookie(
-        "access_token", access_token, httponly=True, samesite="Lax", secure=False, max_age=24*60*60
-    )
-    response.set_cookie(
-        "refresh_token", refresh_token, httponly=True, samesite="Lax", secure=False, max_age=30*24*60*60
-    )
+    _set_auth_cookies(response, user)
+    return response, 200
+
+
+@auth_bp.route("/refresh", methods=["POST"])
+@rate_limited
+def refresh():
+    """Exchange the refresh_token cookie for a new token pair.
+
+    Only the token signature is verified, no password hash. The presented
+    refresh token is revoked, so each one can be exchanged once.
+    """
+    payload = verify_token(request.cookies.get("refresh_token", ""))
+    if not payload or payload.get("type") != "refresh" or "jti" not in payload:
+        return jsonify({"error": "Invalid or expired refresh token"}), 401
+
+    store = get_revocation_store()
+    if store.is_revoked(payload["jti"]):
+        return jsonify({"error": "Refresh token has been revoked"}), 401
 
+    user = db.session.get(User, payload["user_id"])
+    if user is None:
+        return jsonify({"error": "Invalid or expired refresh token"}), 401
+
+    # Revoking first makes concurrent exchanges of one token race on the
+    # revoked_tokens unique key; only the winner gets new tokens
+    if not store.revoke(payload["jti"], user.id, payload["exp"]):
+        return jsonify({"error": "Refresh token has been revoked"}), 401
+
+    response = jsonify({"message": "Token refreshed", "user": user.to_dict()})
+    _set_auth_cookies(response, user)
     return response, 200
 
 
 @auth_bp.route("/logout", methods=["POST"])
 @token_required
 def logout():
-    """Logout the current user."""
+    """Logout the current user.
+
+    Other worker processes keep accepting the access token until their
+    next revocation sync (REVOCATION_SYNC_INTERVAL, 5 s by default).
+    """
     user_id = request.user_id
     username = request.username
 
+    # Revoke both tokens so copies of the cookies stop working too
+    store = get_revocation_store()
+    if request.token_jti:
+        store.revoke(request.token_jti, user_id, request.token_exp)
+    refresh_payload = verify_token(request.cookies.get("refresh_token", ""))
+    if (
+        refresh_payload
+        and refresh_payload.get("type") == "refresh"
+        and refresh_payload.get("user_id") == user_id
+        and "jti" in refresh_payload
+    ):
+        store.revoke(refresh_payload["jti"], user_id, refresh_payload["exp"])
+
     # Log action
-    log = AuditLog(user_id=user_id, action=f"User logged out: {username}")
-    db.session.add(log)
-    db.session.commit()
+    record_audit(user_id, f"User logged out: {username}")
 
     response = jsonify({"message": "Logout successful"})
     
@@ -145,27 +312,161 @@ def get_current_user_endpoint():
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    return jsonify(user.to_dict()), 200
+    etag = make_etag(request.endpoint, user.id, user.updated_at)
+    if not_modified(etag, user.updated_at):
+        return not_modified_response(etag, user.updated_at, private=True)
+
+    response = jsonify(user.to_dict())
+    return add_validators(response, etag, user.updated_at, private=True), 200
 
 
 # ============ COURSES ROUTES ============
 
 
+def _cached_json_response(entry, use_modified_since=True):
+    """Build a JSON response (or 304) from a cached (body, etag, ...) entry"""
+    body, etag, last_modified, next_cursor = entry
+    if not_modified(etag, last_modified, use_modified_since):
+        return not_modified_response(etag, last_modified)
+
+    response = current_app.response_class(body, mimetype="application/json")
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return add_validators(response, etag, last_modified)
+
+
 @courses_bp.route("", methods=["GET"])
 def list_courses():
-    """Get all courses."""
-    courses = Course.query.all()
-    return jsonify([course.to_dict() for course in courses]), 200
+    """Get all courses, optionally filtered and paginated."""
+    try:
+        limit, after_id = parse_page_args(request.args)
+        fields = parse_fields(request.args, COURSE_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    cache = get_cache()
+    cache_key = course_list_key(request.query_string.decode())
+    entry = cache.get(cache_key)
+    if entry is not None:
+        return _cached_json_response(entry, use_modified_since=False)
+    cache_version = cache.version()
+
+    filters = []
+
+    instructor_id = request.args.get("instructor_id", type=int)
+    if instructor_id is not None:
+        filters.append(Course.instructor_id == instructor_id)
+
+    title_prefix = request.args.get("title_prefix")
+    if title_prefix:
+        filters.append(
+            Course.title.like(escape_like(title_prefix) + "%", escape="\\")
+        )
+
+    # Fingerprint the matching rows before building the listing; enrollment
+    # changes bump Course.updated_at, so count + max(updated_at) covers them
+    count, last_modified = db.session.execute(
+        db.select(db.func.count(Course.id), db.func.max(Course.updated_at)).where(
+            *filters
+        )
+    ).one()
+    etag = make_etag(request.query_string.decode(), count, last_modified)
+    if not_modified(etag, last_modified, use_modified_since=False):
+        return not_modified_response(etag, last_modified)
+
+    query = paginate(
+        COURSE_SCHEMA.select().where(*filters), Course.id, limit, after_id
+    )
+    rows, next_cursor = split_page(db.session.execute(query), limit)
+
+    body = dumps(COURSE_SCHEMA.to_dicts(rows, fields))
+    entry = (body, etag, last_modified, next_cursor)
+    cache.set(cache_key, entry, version=cache_version)
+    return _cached_json_response(entry, use_modified_since=False)
+
+
+@courses_bp.route("/search", methods=["GET"])
+def search_courses():
+    """Full-text search over course titles and descriptions, best match first.
+
+    `q` words are prefix-matched and all must appear. Supports
+    instructor_id, fields and limit/cursor paging; since results are in
+    rank order, the cursor holds an offset rather than a row id.
+    """
+    try:
+        terms = search_terms(request.args.get("q"))
+        limit, offset = parse_page_args(request.args)
+        fields = parse_fields(request.args, COURSE_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if offset is not None and offset < 0:
+        return jsonify({"error": "Invalid cursor"}), 400
+    limit = limit or DEFAULT_PAGE_LIMIT
+    offset = offset or 0
+
+    query = COURSE_SCHEMA.select()
+    instructor_id = request.args.get("instructor_id", type=int)
+    if instructor_id is not None:
+        query = query.where(Course.instructor_id == instructor_id)
+    query = search_query(query, terms).offset(offset).limit(limit + 1)
+
+    rows = db.session.execute(query).all()
+    response = json_response(COURSE_SCHEMA.to_dicts(rows[:limit], fields))
+    if len(rows) > limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(offset + limit)
+    return response
+
+
+@courses_bp.route("/seats/stream", methods=["GET"])
+def stream_seats():
+    """Stream live seat counts as Server-Sent Events.
+
+    Sends "seats" {course_id, enrolled_count, capacity}, "course_deleted"
+    {course_id} and "resync" (re-fetch the catalogue). Browsers resume
+    after a reconnect from the Last-Event-ID they send.
+    """
+    events = get_seat_events()
+    if not hasattr(events, "stream"):
+        # SEAT_EVENTS_BACKEND=relay: the seat stream server answers this path
+        return jsonify({"error": "Seat stream is served by the relay"}), 404
+    if not events.try_subscribe():
+        response = jsonify({"error": "Too many open seat streams"})
+        response.headers["Retry-After"] = "5"
+        return response, 503
+
+    last_id = parse_last_event_id(request.headers.get("Last-Event-ID"))
+    response = Response(
+        events.stream(last_id),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    response.call_on_close(events.unsubscribe)
+    return response
 
 
 @courses_bp.route("/<int:course_id>", methods=["GET"])
 def get_course(course_id):
     """Get a specific course."""
-    course = Course.query.get(course_id)
-    if not course:
+    cache = get_cache()
+    entry = cache.get(course_key(course_id))
+    if entry is not None:
+        return _cached_json_response(entry)
+    cache_version = cache.version()
+
+    row = db.session.execute(
+        COURSE_SCHEMA.select().where(Course.id == course_id)
+    ).first()
+    if not row:
         return jsonify({"error": "Course not found"}), 404
 
-    return jsonify(course.to_dict()), 200
+    etag = make_etag(row.id, row.updated_at)
+    if not_modified(etag, row.updated_at):
+        return not_modified_response(etag, row.updated_at)
+
+    body = dumps(COURSE_SCHEMA.encoder()(row))
+    entry = (body, etag, row.updated_at, None)
+    cache.set(course_key(course_id), entry, version=cache_version)
+    return _cached_json_response(entry)
 
 
 @courses_bp.route("", methods=["POST"])
@@ -194,12 +495,9 @@ def create_course():
     )
 
     db.session.add(course)
+    record_audit(request.user_id, f"Course created: {course.title}", durable=True)
     db.session.commit()
-
-    # Log action
-    log = AuditLog(user_id=request.user_id, action=f"Course created: {course.title}")
-    db.session.add(log)
-    db.session.commit()
+    invalidate_course(course.id)
 
     return jsonify({"message": "Course created", "course": course.to_dict()}), 201
 
@@ -222,17 +520,22 @@ def update_course(course_id):
 
     data = request.get_json()
 
+    capacity = data.get("capacity", course.capacity)
+    if not isinstance(capacity, int) or capacity < 0:
+        return jsonify({"error": "capacity must be a non-negative integer"}), 400
+
+    old_capacity = course.capacity
     course.title = data.get("title", course.title)
     course.description = data.get("description", course.description)
     course.credits = data.get("credits", course.credits)
-    course.capacity = data.get("capacity", course.capacity)
+    course.capacity = capacity
 
+    if course.capacity > old_capacity:
+        _promote_waitlist(course)
+    record_audit(request.user_id, f"Course updated: {course.title}", durable=True)
     db.session.commit()
-
-    # Log action
-    log = AuditLog(user_id=request.user_id, action=f"Course updated: {course.title}")
-    db.session.add(log)
-    db.session.commit()
+    invalidate_course(course.id)
+    _publish_seats(course.id)
 
     return jsonify({"message": "Course updated", "course": course.to_dict()}), 200
 
@@ -255,12 +558,10 @@ def delete_course(course_id):
 
     course_title = course.title
     db.session.delete(course)
+    record_audit(request.user_id, f"Course deleted: {course_title}", durable=True)
     db.session.commit()
-
-    # Log action
-    log = AuditLog(user_id=request.user_id, action=f"Course deleted: {course_title}")
-    db.session.add(log)
-    db.session.commit()
+    invalidate_course(course_id)
+    publish_course_deleted(course_id)
 
     return jsonify({"message": "Course deleted"}), 200
 
@@ -268,8 +569,40 @@ def delete_course(course_id):
 # ============ ENROLLMENTS ROUTES ============
 
 
+def _existing_enrollment_response(enrollment):
+    if enrollment is not None and enrollment.status == "pending":
+        return (
+            jsonify(
+                {
+                    "error": "Already on the waitlist for this course",
+                    "position": waitlist_position(enrollment),
+                }
+            ),
+            409,
+        )
+    return jsonify({"error": "Already enrolled in this course"}), 409
+
+
+def _publish_seats(course_id):
+    """Push the committed seat counts of a course to live subscribers"""
+    row = db.session.execute(
+        db.select(Course.enrolled_count, Course.capacity).where(Course.id == course_id)
+    ).first()
+    if row is not None:
+        publish_seats(course_id, row.enrolled_count, row.capacity)
+
+
+def _promote_waitlist(course):
+    """Fill the course's free seats from its waitlist, in this transaction"""
+    for _, student_id in promote_waitlist(course.id):
+        record_audit(
+            student_id, f"Promoted from waitlist: {course.title}", durable=True
+        )
+
+
 @enrollments_bp.route("", methods=["POST"])
 @token_required
+@rate_limited
 def enroll_in_course():
     """Enroll student in a course."""
     data = request.get_json()
@@ -281,36 +614,62 @@ def enroll_in_course():
     if not course:
         return jsonify({"error": "Course not found"}), 404
 
-    # Check if already enrolled
-    existing = Enrollment.query.filter_by(
-        student_id=request.user_id, course_id=data["course_id"]
-    ).first()
-
-    if existing:
-        return jsonify({"error": "Already enrolled in this course"}), 409
-
-    # Check capacity
-    enrolled_count = Enrollment.query.filter_by(
-        course_id=data["course_id"], status="enrolled"
-    ).count()
-
-    if enrolled_count >= course.capacity:
-        return jsonify({"error": "Course is at capacity"}), 400
-
+    # Reserve a seat with a single conditional UPDATE so concurrent requests
+    # cannot oversubscribe the course
+    reserved = db.session.execute(
+        db.update(Course)
+        .where(Course.id == course.id, Course.enrolled_count < Course.capacity)
+        .values(enrolled_count=Course.enrolled_count + 1)
+    ).rowcount
+
+    if not reserved:
+        existing = Enrollment.query.filter_by(
+            student_id=request.user_id, course_id=course.id
+        ).first()
+        if existing:
+            return _existing_enrollment_response(existing)
+
+    # A full course puts the student on its waitlist instead of turning them
+    # away, so clients wait for a promotion rather than retrying
     enrollment = Enrollment(
-        student_id=request.user_id, course_id=data["course_id"], status="enrolled"
+        student_id=request.user_id,
+        course_id=course.id,
+        status="enrolled" if reserved else "pending",
     )
 
     db.session.add(enrollment)
-    db.session.commit()
-
-    # Log action
-    log = AuditLog(
-        user_id=request.user_id, action=f"Enrolled in course: {course.title}"
-    )
-    db.session.add(log)
-    db.session.commit()
-
+    try:
+        if not reserved:
+            db.session.flush()
+            # A seat may have been released since the reservation failed
+            _promote_waitlist(course)
+        if enrollment.status == "enrolled":
+            action = f"Enrolled in course: {course.title}"
+        else:
+            action = f"Joined waitlist for course: {course.title}"
+        record_audit(request.user_id, action, durable=True)
+        db.session.commit()
+    except IntegrityError:
+        # unique_enrollment rejected the row; the seat reservation rolls back too
+        db.session.rollback()
+        existing = Enrollment.query.filter_by(
+            student_id=request.user_id, course_id=course.id
+        ).first()
+        return _existing_enrollment_response(existing)
+    invalidate_course(course.id)
+    _publish_seats(course.id)
+
+    if enrollment.status == "pending":
+        return (
+            jsonify(
+                {
+                    "message": "Course is full; added to the waitlist",
+                    "enrollment": enrollment.to_dict(),
+                    "position": waitlist_position(enrollment),
+                }
+            ),
+            202,
+        )
     return (
         jsonify(
             {"message": "Enrolled successfully", "enrollment": enrollment.to_dict()}
@@ -319,12 +678,104 @@ def enroll_in_course():
     )
 
 
+@enrollments_bp.route("/bulk", methods=["POST"])
+@admin_required
+@rate_limited
+def bulk_enroll_endpoint():
+    """Enroll many (student, course) pairs from a CSV or NDJSON body (admin only).
+
+    Rows skip the waitlist: a free seat goes to the imported row even if
+    other students are already waiting for the course.
+    """
+    upload = request.files.get("file")
+    stream = upload.stream if upload else request.stream
+    try:
+        fmt = detect_format(
+            filename=upload.filename if upload else None,
+            mimetype=request.mimetype,
+            explicit=request.args.get("format"),
+        )
+        chunk_size = request.args.get("chunk_size", DEFAULT_CHUNK_SIZE, type=int)
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    def chunk_committed(course_ids, _processed):
+        for course_id in course_ids:
+            invalidate_course(course_id)
+        publish_seat_counts(course_ids)
+
+    report = bulk_enroll(
+        iter_records(stream, fmt), chunk_size=chunk_size, on_chunk=chunk_committed
+    )
+
+    record_audit(
+        request.user_id,
+        f"Bulk enrollment: {report['enrolled']} of {report['total']} rows",
+    )
+    return jsonify(report), 200
+
+
 @enrollments_bp.route("/my-enrollments", methods=["GET"])
 @token_required
 def get_my_enrollments():
-    """Get current user's enrollments."""
-    enrollments = Enrollment.query.filter_by(student_id=request.user_id).all()
-    return jsonify([enrollment.to_dict() for enrollment in enrollments]), 200
+    """Get current user's enrollments, optionally filtered and paginated."""
+    try:
+        limit, after_id = parse_page_args(request.args)
+        fields = parse_fields(request.args, ENROLLMENT_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Course and instructor come from the same joined SELECT, so the
+    # statement count no longer grows with the number of enrollments
+    include_course = fields is None or "course" in fields
+    if include_course:
+        query = enrollments_with_course_query()
+    else:
+        query = ENROLLMENT_SCHEMA.select()
+    query = query.where(Enrollment.student_id == request.user_id)
+
+    status = request.args.get("status")
+    if status:
+        query = query.where(Enrollment.status == status)
+
+    query = paginate(query, Enrollment.id, limit, after_id)
+    rows, next_cursor = split_page(db.session.execute(query), limit)
+
+    encode = enrollment_encoder(fields, include_course)
+    response = json_response([encode(row) for row in rows])
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response, 200
+
+
+@enrollments_bp.route("/<int:enrollment_id>/position", methods=["GET"])
+@token_required
+def get_waitlist_position(enrollment_id):
+    """Get a waitlisted enrollment's place in the queue (1 is next in line)."""
+    enrollment = db.session.get(Enrollment, enrollment_id)
+
+    if not enrollment:
+        return jsonify({"error": "Enrollment not found"}), 404
+
+    if enrollment.student_id != request.user_id and request.role != "admin":
+        return jsonify({"error": "Not authorized"}), 403
+
+    position = None
+    if enrollment.status == "pending":
+        position = waitlist_position(enrollment)
+    return (
+        jsonify(
+            {
+                "enrollment_id": enrollment.id,
+                "course_id": enrollment.course_id,
+                "status": enrollment.status,
+                "position": position,
+            }
+        ),
+        200,
+    )
 
 
 @enrollments_bp.route("/<int:enrollment_id>", methods=["DELETE"])
@@ -339,16 +790,26 @@ def unenroll(enrollment_id):
     if enrollment.student_id != request.user_id:
         return jsonify({"error": "Not authorized"}), 403
 
-    course_title = enrollment.course.title
-    db.session.delete(enrollment)
-    db.session.commit()
-
-    # Log action
-    log = AuditLog(
-        user_id=request.user_id, action=f"Unenrolled from course: {course_title}"
-    )
-    db.session.add(log)
+    course = enrollment.course
+    course_id = course.id
+    if enrollment.status == "enrolled":
+        # Release the seat and hand it to the head of the waitlist in the
+        # same transaction as the delete
+        db.session.execute(
+            db.update(Course)
+            .where(Course.id == course_id, Course.enrolled_count > 0)
+            .values(enrolled_count=Course.enrolled_count - 1)
+        )
+        db.session.delete(enrollment)
+        _promote_waitlist(course)
+        action = f"Unenrolled from course: {course.title}"
+    else:
+        db.session.delete(enrollment)
+        action = f"Left waitlist for course: {course.title}"
+    record_audit(request.user_id, action, durable=True)
     db.session.commit()
+    invalidate_course(course_id)
+    _publish_seats(course_id)
 
     return jsonify({"message": "Unenrolled successfully"}), 200
 
@@ -359,9 +820,59 @@ def unenroll(enrollment_id):
 @users_bp.route("", methods=["GET"])
 @admin_required
 def list_users():
-    """Get all users (admin only)."""
-    users = User.query.all()
-    return jsonify({"users": [user.to_dict() for user in users]}), 200
+    """Get all users (admin only), optionally filtered and paginated."""
+    try:
+        limit, after_id = parse_page_args(request.args)
+        fields = parse_fields(request.args, USER_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    query = USER_SCHEMA.select()
+
+    role = request.args.get("role")
+    if role:
+        query = query.where(User.role == role)
+
+    query = paginate(query, User.id, limit, after_id)
+    rows, next_cursor = split_page(db.session.execute(query), limit)
+
+    response = json_response(
+        {"users": USER_SCHEMA.to_dicts(rows, fields), "next_cursor": next_cursor}
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response, 200
+
+
+@users_bp.route("/bulk", methods=["POST"])
+@admin_required
+def bulk_create_users_endpoint():
+    """Create users from a CSV or NDJSON roster (admin only)."""
+    upload = request.files.get("file")
+    stream = upload.stream if upload else request.stream
+    try:
+        fmt = detect_format(
+            filename=upload.filename if upload else None,
+            mimetype=request.mimetype,
+            explicit=request.args.get("format"),
+        )
+        chunk_size = request.args.get("chunk_size", DEFAULT_CHUNK_SIZE, type=int)
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    report = bulk_create_users(
+        iter_records(stream, fmt),
+        chunk_size=chunk_size,
+        workers=current_app.config["BULK_HASH_WORKERS"],
+    )
+
+    record_audit(
+        request.user_id,
+        f"Bulk user import: {report['created']} of {report['total']} rows",
+    )
+    return jsonify(report), 200
 
 
 @users_bp.route("/<int:user_id>", methods=["GET"])
@@ -372,7 +883,12 @@ def get_user(user_id):
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    return jsonify(user.to_dict()), 200
+    etag = make_etag(request.endpoint, user.id, user.updated_at)
+    if not_modified(etag, user.updated_at):
+        return not_modified_response(etag, user.updated_at, private=True)
+
+    response = jsonify(user.to_dict())
+    return add_validators(response, etag, user.updated_at, private=True), 200
 
 
 # ============ PROFILE ROUTES ============
@@ -390,7 +906,12 @@ def get_profile(user_id):
     if request.user_id != user_id and request.role != "admin":
         return jsonify({"error": "Forbidden"}), 403
 
-    return jsonify(user.to_dict(include_profile=True)), 200
+    etag = make_etag(request.endpoint, user.id, user.updated_at)
+    if not_modified(etag, user.updated_at):
+        return not_modified_response(etag, user.updated_at, private=True)
+
+    response = jsonify(user.to_dict(include_profile=True))
+    return add_validators(response, etag, user.updated_at, private=True), 200
 
 
 @users_bp.route("/profile/<int:user_id>", methods=["PUT"])
@@ -416,7 +937,16 @@ def update_profile(user_id):
         if "bio" in data:
             user.bio = data["bio"]
         if "profile_picture_url" in data:
-            user.profile_picture_url = data["profile_picture_url"]
+            picture = data["profile_picture_url"]
+            if picture and picture.startswith("data:"):
+                # Keep inline images out of the users row
+                digest = get_blobstore().put_bytes(
+                    decode_data_url(picture),
+                    current_app.config["PROFILE_PICTURE_MAX_BYTES"],
+                    require_image=True,
+                )
+                picture = media_url(digest)
+            user.profile_picture_url = picture
         if "address" in data:
             user.address = data["address"]
         if "city" in data:
@@ -430,12 +960,7 @@ def update_profile(user_id):
         db.session.commit()
 
         # Log action
-        log = AuditLog(
-            user_id=request.user_id,
-            action=f"Updated profile for user: {user.username}",
-        )
-        db.session.add(log)
-        db.session.commit()
+        record_audit(request.user_id, f"Updated profile for user: {user.username}")
 
         return (
             jsonify(
@@ -446,19 +971,22 @@ def update_profile(user_id):
             ),
             200,
         )
+    except BlobTooLarge as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 413
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         db.session.rollback()
-        import traceback
-
-        print(f"Error updating profile: {str(e)}")
-        print(traceback.format_exc())
+        current_app.logger.exception("Failed to update profile for user %s", user_id)
         return jsonify({"error": f"Failed to update profile: {str(e)}"}), 500
 
 
 @users_bp.route("/profile/<int:user_id>/picture", methods=["POST"])
 @token_required
 def upload_profile_picture(user_id):
-    """Upload profile picture as base64 or file."""
+    """Upload profile picture as a file, raw image body, base64 or URL."""
     user = User.query.get(user_id)
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -467,27 +995,46 @@ def upload_profile_picture(user_id):
     if request.user_id != user_id and request.role != "admin":
         return jsonify({"error": "Forbidden"}), 403
 
-    data = request.get_json()
+    store = get_blobstore()
+    max_bytes = current_app.config["PROFILE_PICTURE_MAX_BYTES"]
 
-    if "picture_base64" in data:
-        # Store base64 string directly (for client-side uploads)
-        user.profile_picture_url = data["picture_base64"]
-    elif "picture_url" in data:
-        # Store URL reference
-        user.profile_picture_url = data["picture_url"]
-    else:
-        return jsonify({"error": "No picture provided"}), 400
+    try:
+        if "picture" in request.files:
+            # Multipart upload, streamed from the spooled request file
+            digest = store.put_stream(
+                request.files["picture"].stream, max_bytes, require_image=True
+            )
+            user.profile_picture_url = media_url(digest)
+        elif request.mimetype.startswith("image/"):
+            # Raw binary body
+            digest = store.put_stream(request.stream, max_bytes, require_image=True)
+            user.profile_picture_url = media_url(digest)
+        else:
+            data = request.get_json(silent=True) or {}
+            if "picture_base64" in data:
+                digest = store.put_bytes(
+                    decode_data_url(data["picture_base64"]),
+                    max_bytes,
+                    require_image=True,
+                )
+                user.profile_picture_url = media_url(digest)
+            elif "picture_url" in data:
+                # Store URL reference
+                user.profile_picture_url = data["picture_url"]
+            else:
+                return jsonify({"error": "No picture provided"}), 400
+    except BlobTooLarge as e:
+        return jsonify({"error": str(e)}), 413
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     user.updated_at = datetime.utcnow()
     db.session.commit()
 
     # Log action
-    log = AuditLog(
-        user_id=request.user_id,
-        action=f"Updated profile picture for user: {user.username}",
+    record_audit(
+        request.user_id, f"Updated profile picture for user: {user.username}"
     )
-    db.session.add(log)
-    db.session.commit()
 
     return (
         jsonify(
@@ -498,3 +1045,174 @@ def upload_profile_picture(user_id):
         ),
         200,
     )
+
+
+# ============ MEDIA ROUTES ============
+
+
+@media_bp.route("/<digest>", methods=["GET"])
+def get_media(digest):
+    """Serve a stored image by content digest."""
+    store = get_blobstore()
+    if not store.exists(digest):
+        return jsonify({"error": "Not found"}), 404
+
+    # Content-addressed blobs never change, so they can be cached forever;
+    # send_file handles If-None-Match and Range requests
+    response = send_file(
+        store.path(digest),
+        mimetype=store.content_type(digest),
+        conditional=True,
+        etag=digest,
+        max_age=365 * 24 * 60 * 60,
+    )
+    response.cache_control.immutable = True
+    response.cache_control.public = True
+    return response
+
+
+# ============ ADMIN ROUTES ============
+
+
+@admin_bp.route("/audit/stats", methods=["GET"])
+@admin_required
+def audit_stats():
+    """Get audit writer queue and flush counters (admin only)."""
+    return jsonify(current_app.extensions["audit"].stats()), 200
+
+
+@admin_bp.route("/cache/stats", methods=["GET"])
+@admin_required
+def cache_stats():
+    """Get response cache hit/miss/eviction counters (admin only)."""
+    return jsonify(get_cache().stats()), 200
+
+
+@admin_bp.route("/rate-limits/stats", methods=["GET"])
+@admin_required
+def rate_limit_stats():
+    """Get per-limiter admitted, limited and shed counters (admin only)."""
+    return jsonify(get_rate_limiter().stats()), 200
+
+
+@admin_bp.route("/db/stats", methods=["GET"])
+@admin_required
+def db_stats():
+    """Get connection pool occupancy and checkout wait times (admin only)."""
+    return jsonify(engine_stats(db.engine)), 200
+
+
+def _parse_timestamp(value, name):
+    """Parse an ISO 8601 query value into the naive UTC used by the models"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO 8601 timestamp")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _audit_filters(args):
+    filters = []
+    user_id = args.get("user_id")
+    if user_id is not None:
+        try:
+            filters.append(AuditLog.user_id == int(user_id))
+        except ValueError:
+            raise ValueError("user_id must be an integer")
+
+    action = args.get("action")
+    if action:
+        filters.append(AuditLog.action.like(escape_like(action) + "%", escape="\\"))
+
+    since = args.get("since")
+    if since:
+        filters.append(AuditLog.timestamp >= _parse_timestamp(since, "since"))
+    until = args.get("until")
+    if until:
+        filters.append(AuditLog.timestamp < _parse_timestamp(until, "until"))
+    return filters
+
+
+@admin_bp.route("/audit", methods=["GET"])
+@admin_required
+def list_audit_log():
+    """Query the audit log newest first (admin only).
+
+    Filters: user_id, action (prefix), since and until (ISO 8601). Returns
+    keyset-paginated JSON, or streams every match with format=ndjson|csv.
+    """
+    try:
+        filters = _audit_filters(request.args)
+        stream = "format" in request.args and request.args["format"] != "json"
+        if stream:
+            fmt = parse_export_format(request.args)
+            after_id = parse_after_id(request.args)
+            limit = request.args.get("limit", type=int)
+        else:
+            limit, after_id = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    query = AUDIT_SCHEMA.select().where(*filters)
+
+    if stream:
+        query = paginate(query, AuditLog.id, None, after_id, descending=True)
+        if limit:
+            query = query.limit(limit)
+
+        def generate():
+            rows = db.session.execute(
+                query.execution_options(yield_per=STREAM_YIELD_PER)
+            )
+            yield from encode_rows((row._mapping for row in rows), fmt, AUDIT_FIELDS)
+
+        return streaming_response(generate(), fmt, "audit-log")
+
+    limit = limit or DEFAULT_PAGE_LIMIT
+    query = paginate(query, AuditLog.id, limit, after_id, descending=True)
+    rows, next_cursor = split_page(db.session.execute(query), limit)
+
+    response = json_response(
+        {"entries": AUDIT_SCHEMA.to_dicts(rows), "next_cursor": next_cursor}
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response, 200
+
+
+@admin_bp.route("/export/<table>", methods=["GET"])
+@admin_required
+def export_table(table):
+    """Stream users, courses or enrollments as NDJSON or CSV (admin only).
+
+    Rows come from a server-side cursor in id order, so memory stays flat
+    whatever the table size. Resume an interrupted export with after_id set
+    to the last id received; limit caps the rows sent.
+    """
+    if table not in EXPORTS:
+        return jsonify({"error": "Unknown export"}), 404
+    model, allowed = EXPORTS[table]
+
+    try:
+        fmt = parse_export_format(request.args)
+        after_id = parse_after_id(request.args)
+        columns = parse_fields(request.args, allowed) or allowed
+        limit = request.args.get("limit", type=int)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if model is Course:
+        query = Course.listing_query()
+    else:
+        query = db.select(*(getattr(model, name) for name in allowed))
+    query = paginate(query, model.id, None, after_id)
+    if limit:
+        query = query.limit(limit)
+
+    def generate():
+        rows = db.session.execute(query.execution_options(yield_per=STREAM_YIELD_PER))
+        yield from encode_rows((row._mapping for row in rows), fmt, columns)
+
+    return streaming_response(generate(), fmt, table)
@@ -0,0 +1,73 @@
+"""Course full-text search.
+
+On SQLite, searches run against the courses_fts FTS5 index (see migration
+4), which triggers keep in sync with the courses table. Other databases
+fall back to LIKE matching on title and description.
+"""
+
+import re
+from flask import current_app
+from sqlalchemy import inspect
+from models import db, Course
+from pagination import escape_like
+
+FTS_TABLE = "courses_fts"
+MAX_SEARCH_TERMS = 8
+
+courses_fts = db.table(FTS_TABLE, db.column("rowid"), db.column("rank"))
+_fts_match = db.literal_column(FTS_TABLE)
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(q):
+    """Split a user query into at most MAX_SEARCH_TERMS words or raise ValueError"""
+    terms = _TERM.findall(q or "")[:MAX_SEARCH_TERMS]
+    if not terms:
+        raise ValueError("q must contain at least one word")
+    return terms
+
+
+def fts_query(terms):
+    """Quote each term and make it a prefix match: pyth intro -> "pyth"* "intro"*"""
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def fts_available():
+    """Whether the FTS5 index exists, checked once per app"""
+    available = current_app.extensions.get("course_search_fts")
+    if available is None:
+        engine = db.engine
+        available = engine.dialect.name == "sqlite" and inspect(engine).has_table(
+            FTS_TABLE
+        )
+        current_app.extensions["course_search_fts"] = available
+    return available
+
+
+def search_query(base_query, terms):
+    """Restrict a course select to matches for `terms`, best matches first"""
+    if fts_available():
+        return (
+            base_query.join(courses_fts, courses_fts.c.rowid == Course.id)
+            .where(_fts_match.op("MATCH")(fts_query(terms)))
+            .order_by(None)
+            .order_by(courses_fts.c.rank, Course.id)
+        )
+
+    # Without an index, rank title matches above description-only ones
+    conditions = []
+    title_hits = []
+    for term in terms:
+        pattern = "%" + escape_like(term) + "%"
+        title_hit = Course.title.ilike(pattern, escape="\\")
+        title_hits.append(title_hit)
+        conditions.append(
+            db.or_(title_hit, Course.description.ilike(pattern, escape="\\"))
+        )
+    title_score = sum(db.case((hit, 1), else_=0) for hit in title_hits)
+    return (
+        base_query.where(*conditions)
+        .order_by(None)
+        .order_by(title_score.desc(), Course.id)
+    )
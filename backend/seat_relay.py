@@ -0,0 +1,116 @@
+"""Asyncio relay serving seat events to many idle SSE clients.
+
+Run with `flask seat-stream-server`. App workers publish to it through
+RelayPublisher (events.py); it keeps the same EventLog backlog and serves
+GET /courses/seats/stream with one coroutine per client, so thousands of
+open streams cost memory, not threads.
+"""
+
+import asyncio
+import hmac
+import json
+from events import KEEPALIVE, RETRY_MS, STREAM_PATH, EventLog, parse_last_event_id
+
+MAX_HEADER_BYTES = 8192
+
+
+class SeatRelay:
+    def __init__(self, authkey, backlog, keepalive):
+        self.authkey = authkey
+        self.keepalive = keepalive
+        self.clients = 0
+        self._log = EventLog(backlog)
+        self._condition = asyncio.Condition()
+
+    # ============ PUBLISHERS ============
+
+    async def handle_publisher(self, reader, writer):
+        try:
+            key = (await reader.readline()).rstrip(b"\n")
+            if not hmac.compare_digest(key, self.authkey):
+                return
+            while line := await reader.readline():
+                message = json.loads(line)
+                async with self._condition:
+                    self._log.append(message["event"], message["data"])
+                    self._condition.notify_all()
+        except (ConnectionError, ValueError, KeyError):
+            pass
+        finally:
+            writer.close()
+
+    # ============ SSE CLIENTS ============
+
+    async def handle_client(self, reader, writer):
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            writer.close()
+            return
+
+        request_line, *header_lines = request.decode("latin-1").split("\r\n")
+        method, path, _ = (request_line.split(" ") + ["", ""])[:3]
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if method != "GET" or path.split("?")[0] != STREAM_PATH:
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+            writer.close()
+            return
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Access-Control-Allow-Origin: *\r\n"
+            b"X-Accel-Buffering: no\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        last_id = parse_last_event_id(headers.get("last-event-id"))
+        self.clients += 1
+        try:
+            await self._stream(writer, last_id)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.clients -= 1
+            writer.close()
+
+    async def _stream(self, writer, last_id):
+        if last_id is None:
+            last_id = self._log.last_id
+        writer.write(f"retry: {RETRY_MS}\n\n".encode())
+        await writer.drain()
+        while True:
+            async with self._condition:
+                try:
+                    await asyncio.wait_for(
+                        self._condition.wait_for(lambda: self._log.last_id != last_id),
+                        self.keepalive,
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                messages = self._log.since(last_id)
+                if messages is None:
+                    messages = [self._log.resync()]
+                last_id = self._log.last_id
+            writer.write(("".join(messages) if messages else KEEPALIVE).encode())
+            await writer.drain()
+
+
+async def _serve(relay, publish_address, stream_address):
+    publishers = await asyncio.start_server(relay.handle_publisher, *publish_address)
+    clients = await asyncio.start_server(
+        relay.handle_client, *stream_address, limit=MAX_HEADER_BYTES
+    )
+    async with publishers, clients:
+        await asyncio.gather(publishers.serve_forever(), clients.serve_forever())
+
+
+def serve_seat_relay(publish_address, stream_address, authkey, backlog, keepalive):
+    """Run the relay until interrupted (blocks)."""
+    relay = SeatRelay(authkey, backlog, keepalive)
+    asyncio.run(_serve(relay, publish_address, stream_address))
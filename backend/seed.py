@@ -0,0 +1,94 @@
+"""Demo data for development databases, loaded by `flask seed`"""
+
+from flask import current_app
+from models import db, User, Course, Enrollment, AuditLog, reconcile_enrolled_counts
+from passwords import hash_function
+
+
+def seed_database():
+    """Seed database with demo data."""
+    hash_password = hash_function(current_app.config)
+
+    # Create users
+    teacher = User(
+        username="dr_smith",
+        email="dr.smith@campus.edu",
+        password_hash=hash_password("teacher123"),
+        role="teacher",
+    )
+
+    student1 = User(
+        username="john_doe",
+        email="john@campus.edu",
+        password_hash=hash_password("student123"),
+        role="student",
+    )
+
+    student2 = User(
+        username="jane_smith",
+        email="jane@campus.edu",
+        password_hash=hash_password("student123"),
+        role="student",
+    )
+
+    admin = User(
+        username="admin",
+        email="admin@campus.edu",
+        password_hash=hash_password("admin123"),
+        role="admin",
+    )
+
+    db.session.add_all([teacher, student1, student2, admin])
+    db.session.commit()
+
+    # Create courses
+    course1 = Course(
+        title="Introduction to Python",
+        description="Learn Python basics and fundamental concepts.",
+        instructor_id=teacher.id,
+        credits=3,
+        capacity=30,
+    )
+
+    course2 = Course(
+        title="Web Development with Flask",
+        description="Build modern web applications using Flask framework.",
+        instructor_id=teacher.id,
+        credits=4,
+        capacity=25,
+    )
+
+    course3 = Course(
+        title="Database Design",
+        description="Learn SQL, database normalization, and data modeling.",
+        instructor_id=teacher.id,
+        credits=3,
+        capacity=20,
+    )
+
+    db.session.add_all([course1, course2, course3])
+    db.session.commit()
+
+    # Create enrollments
+    enrollment1 = Enrollment(
+        student_id=student1.id, course_id=course1.id, status="enrolled"
+    )
+
+    enrollment2 = Enrollment(
+        student_id=student1.id, course_id=course2.id, status="enrolled"
+    )
+
+    enrollment3 = Enrollment(
+        student_id=student2.id, course_id=course1.id, status="enrolled"
+    )
+
+    db.session.add_all([enrollment1, enrollment2, enrollment3])
+    db.session.commit()
+    reconcile_enrolled_counts()
+
+    # Create audit log entries
+    log1 = AuditLog(user_id=teacher.id, action="Teacher user created")
+    log2 = AuditLog(user_id=student1.id, action="Student user created")
+
+    db.session.add_all([log1, log2])
+    db.session.commit()
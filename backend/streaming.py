@@ -0,0 +1,106 @@
+"""Streaming NDJSON/CSV response helpers for exports"""
+
+import csv
+import io
+import json
+import zlib
+from flask import Response, request, stream_with_context
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Rows are joined into chunks of roughly this size before being sent
+STREAM_CHUNK_BYTES = 64 * 1024
+# Rows fetched per round trip from the server-side cursor
+STREAM_YIELD_PER = 1000
+
+
+def parse_export_format(args, default="ndjson"):
+    """Return the requested `format=` for a stream or raise ValueError"""
+    fmt = args.get("format", default).lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    return fmt
+
+
+def _json_default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def encode_rows(rows, fmt, columns):
+    """Yield `rows` (mappings) as NDJSON or CSV text in chunks.
+
+    `columns` fixes the CSV header and the key order of each record.
+    """
+    buffer = io.StringIO()
+    writer = None
+    if fmt == "csv":
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+
+    for row in rows:
+        if writer is not None:
+            writer.writerow([_csv_value(row[column]) for column in columns])
+        else:
+            record = {column: row[column] for column in columns}
+            buffer.write(
+                json.dumps(record, default=_json_default, separators=(",", ":"))
+            )
+            buffer.write("\n")
+
+        if buffer.tell() >= STREAM_CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def gzip_chunks(chunks, level=6):
+    """Compress a stream of text chunks into a single gzip member"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def wants_gzip():
+    return request.accept_encodings["gzip"] > 0 or request.args.get("gzip") == "1"
+
+
+def streaming_response(chunks, fmt, filename, headers=None):
+    """Wrap text chunks in a streamed (optionally gzip-encoded) response.
+
+    The request context stays open until the last chunk is sent, so the
+    generator may keep using db.session.
+    """
+    headers = dict(headers or {})
+    headers["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    # Stop reverse proxies from buffering the whole export
+    headers["X-Accel-Buffering"] = "no"
+
+    if wants_gzip():
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    else:
+        chunks = (chunk.encode() for chunk in chunks)
+
+    return Response(
+        stream_with_context(chunks),
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers=headers,
+    )
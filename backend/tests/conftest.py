@@ -0,0 +1,91 @@
+"""Fixtures: a fresh app and database per test, plus data factories"""
+
+import pytest
+from app import create_app
+from benchmarks.harness import StatementCounter
+from config import TestingConfig
+from jwt_auth import create_access_token
+from models import db, Course, User
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        TestingConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path}/test.db"
+    )
+    monkeypatch.setattr(
+        TestingConfig, "MEDIA_ROOT", str(tmp_path / "media"), raising=False
+    )
+    app = create_app("testing")
+    yield app
+    app.extensions["audit"].close()
+    app.extensions["token_revocation"].close()
+    with app.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    """Create a user; returns (user_id, auth headers)"""
+    created = 0
+
+    def make(role="student"):
+        nonlocal created
+        created += 1
+        with app.app_context():
+            user = User(
+                username=f"{role}{created}",
+                email=f"{role}{created}@example.edu",
+                password_hash="unused",
+                role=role,
+            )
+            db.session.add(user)
+            db.session.commit()
+            token = create_access_token(user.id, user.username, user.role)
+            return user.id, {"Authorization": f"Bearer {token}"}
+
+    return make
+
+
+@pytest.fixture
+def make_courses(app):
+    """Create `count` courses taught by `instructor_id`; returns their ids"""
+
+    def make(instructor_id, count, capacity=30):
+        with app.app_context():
+            courses = [
+                Course(
+                    title=f"Course {i}",
+                    description="Test course",
+                    instructor_id=instructor_id,
+                    capacity=capacity,
+                )
+                for i in range(count)
+            ]
+            db.session.add_all(courses)
+            db.session.commit()
+            return [course.id for course in courses]
+
+    return make
+
+
+@pytest.fixture
+def count_statements(app):
+    """Run a request and return (response, SQL statements it executed)"""
+    with app.app_context():
+        counter = StatementCounter(db.engine)
+
+    def run(request, *args, **kwargs):
+        counter.start()
+        try:
+            response = request(*args, **kwargs)
+        finally:
+            statements = counter.stop()
+        return response, statements
+
+    return run
@@ -0,0 +1,20 @@
+from benchmarks.harness import compare
+
+META = {
+    "scale": "small",
+    "requests": 100,
+    "concurrency": 4,
+    "seed": 1,
+    "mode": "in-process",
+    "scenarios": ["catalogue_browsing"],
+    "rate_limits": False,
+}
+
+
+def test_compare_refuses_runs_with_different_rate_limits():
+    baseline = {"meta": dict(META, rate_limits=True), "scenarios": {}}
+    current = {"meta": META, "scenarios": {}}
+    assert compare(baseline, current, 0.1) == [
+        "baseline was recorded with rate_limits=True, this run used False"
+    ]
+    assert compare(current, current, 0.1) == []
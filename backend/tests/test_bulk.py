@@ -0,0 +1,40 @@
+from werkzeug.security import check_password_hash
+from bulk import bulk_create_users
+from models import db, Course, User
+
+
+def test_bulk_create_users_hashes_in_worker_processes(app):
+    # Cheap hashes: the test is about the process pool, not the hash cost
+    app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1000"
+    records = [
+        (
+            row,
+            {
+                "username": f"bulk{row}",
+                "email": f"bulk{row}@example.edu",
+                "password": f"secret{row}",
+            },
+        )
+        for row in range(1, 7)
+    ]
+
+    with app.app_context():
+        report = bulk_create_users(records, chunk_size=4, workers=2)
+        assert report["created"] == 6
+        user = db.session.execute(
+            db.select(User).where(User.username == "bulk3")
+        ).scalar_one()
+        assert check_password_hash(user.password_hash, "secret3")
+
+
+def test_cli_warns_when_server_caches_are_not_invalidated(app, make_user, make_courses):
+    instructor_id, _ = make_user("teacher")
+    (course_id,) = make_courses(instructor_id, 1)
+    with app.app_context():
+        db.session.get(Course, course_id).enrolled_count = 4
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["reconcile-enrollment-counts"])
+    assert result.exit_code == 0
+    assert "Repaired enrolled_count on 1 course(s)" in result.stdout
+    assert "RESPONSE_CACHE_BACKEND is not shared" in result.stderr
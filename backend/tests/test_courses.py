@@ -0,0 +1,158 @@
+import multiprocessing
+import socket
+import time
+import pytest
+from app import create_app
+from cache import get_cache, serve_shared_cache
+from config import TestingConfig
+from models import db, Course
+
+
+def test_list_courses_statement_count_is_constant(
+    app, client, make_user, make_courses, count_statements
+):
+    instructor_id, _ = make_user("teacher")
+    make_courses(instructor_id, 3)
+
+    response, few = count_statements(client.get, "/courses?limit=500")
+    assert response.status_code == 200
+    assert len(response.get_json()) == 3
+
+    make_courses(instructor_id, 197)
+    with app.app_context():
+        get_cache().clear()
+
+    response, many = count_statements(client.get, "/courses?limit=500")
+    assert response.status_code == 200
+    courses = response.get_json()
+    assert len(courses) == 200
+    assert all(course["instructor"] for course in courses)
+    assert many == few
+
+
+def _read(client, course_id):
+    """Read a course through the listing and the detail endpoint (both cached)"""
+    listed = {course["id"]: course for course in client.get("/courses").get_json()}
+    response = client.get(f"/courses/{course_id}")
+    detail = response.get_json() if response.status_code == 200 else None
+    return listed.get(course_id), detail
+
+
+def test_course_reads_are_not_stale_after_mutations(client, make_user, make_courses):
+    instructor_id, teacher = make_user("teacher")
+    _, student = make_user()
+    (existing_id,) = make_courses(instructor_id, 1)
+
+    # Warm the listing cache, then create
+    _read(client, existing_id)
+    response = client.post(
+        "/courses", json={"title": "Algorithms", "capacity": 2}, headers=teacher
+    )
+    assert response.status_code == 201
+    course_id = response.get_json()["course"]["id"]
+    listed, detail = _read(client, course_id)
+    assert listed["title"] == detail["title"] == "Algorithms"
+
+    _read(client, course_id)
+    response = client.put(
+        f"/courses/{course_id}",
+        json={"title": "Advanced Algorithms", "capacity": 5},
+        headers=teacher,
+    )
+    assert response.status_code == 200
+    listed, detail = _read(client, course_id)
+    assert listed["title"] == detail["title"] == "Advanced Algorithms"
+    assert listed["capacity"] == detail["capacity"] == 5
+
+    _read(client, course_id)
+    response = client.post(
+        "/enrollments", json={"course_id": course_id}, headers=student
+    )
+    assert response.status_code == 201
+    enrollment_id = response.get_json()["enrollment"]["id"]
+    listed, detail = _read(client, course_id)
+    assert listed["enrolled_count"] == detail["enrolled_count"] == 1
+
+    _read(client, course_id)
+    response = client.delete(f"/enrollments/{enrollment_id}", headers=student)
+    assert response.status_code == 200
+    listed, detail = _read(client, course_id)
+    assert listed["enrolled_count"] == detail["enrolled_count"] == 0
+
+    _read(client, course_id)
+    response = client.delete(f"/courses/{course_id}", headers=teacher)
+    assert response.status_code == 200
+    assert _read(client, course_id) == (None, None)
+
+
+def test_title_prefix_is_case_insensitive_and_indexed(
+    app, client, make_user, make_courses
+):
+    instructor_id, _ = make_user("teacher")
+    make_courses(instructor_id, 3)
+    with app.app_context():
+        db.session.add(Course(title="Intro to Databases", instructor_id=instructor_id))
+        db.session.commit()
+        plan = db.session.execute(
+            db.text(
+                "EXPLAIN QUERY PLAN SELECT id, credits FROM courses "
+                "WHERE title LIKE :pattern ESCAPE '\\'"
+            ),
+            {"pattern": "intro%"},
+        ).all()
+    # A SEARCH (range seek), not a SCAN of the table or of the index
+    assert "SEARCH courses USING INDEX idx_courses_title" in plan[0][-1]
+
+    response = client.get("/courses?title_prefix=intro")
+    assert [course["title"] for course in response.get_json()] == [
+        "Intro to Databases"
+    ]
+
+
+@pytest.fixture
+def cache_server():
+    """A shared response cache on a free local port; returns its address"""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    # Its own process, like `flask cache-server`
+    server = multiprocessing.get_context("spawn").Process(
+        target=serve_shared_cache, args=(("127.0.0.1", port), b"test", 1024, 60)
+    )
+    server.start()
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port)).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    yield f"127.0.0.1:{port}"
+    server.terminate()
+    server.join()
+
+
+def test_writes_in_one_worker_invalidate_the_shared_cache(
+    app, make_user, make_courses, cache_server, monkeypatch
+):
+    monkeypatch.setattr(TestingConfig, "RESPONSE_CACHE_BACKEND", "shared", False)
+    monkeypatch.setattr(TestingConfig, "RESPONSE_CACHE_ADDRESS", cache_server, False)
+    monkeypatch.setattr(TestingConfig, "RESPONSE_CACHE_AUTHKEY", "test", False)
+    # Two apps on the same database stand in for two gunicorn workers
+    writer, reader = create_app("testing"), create_app("testing")
+    instructor_id, teacher = make_user("teacher")
+    (course_id,) = make_courses(instructor_id, 1)
+
+    listed, detail = _read(reader.test_client(), course_id)
+    assert listed["title"] == detail["title"] == "Course 0"
+    response = writer.test_client().put(
+        f"/courses/{course_id}", json={"title": "Renamed"}, headers=teacher
+    )
+    assert response.status_code == 200
+    listed, detail = _read(reader.test_client(), course_id)
+    assert listed["title"] == detail["title"] == "Renamed"
+    with reader.app_context():
+        assert get_cache().stats()["backend"] == "shared"
+
+    for worker in (writer, reader):
+        worker.extensions["audit"].close()
+        worker.extensions["token_revocation"].close()
@@ -0,0 +1,102 @@
+import json
+import threading
+import pytest
+from models import db, Course, Enrollment
+
+MY_ENROLLMENTS = "/enrollments/my-enrollments"
+
+
+def _enroll(app, student_id, course_ids):
+    with app.app_context():
+        db.session.add_all(
+            Enrollment(student_id=student_id, course_id=course_id, status="enrolled")
+            for course_id in course_ids
+        )
+        db.session.commit()
+
+
+@pytest.mark.parametrize("fields", [None, "id,status", "id,course"])
+def test_my_enrollments_statement_count_is_constant(
+    app, client, make_user, make_courses, count_statements, fields
+):
+    instructor_id, _ = make_user("teacher")
+    course_ids = make_courses(instructor_id, 25)
+    one_id, one_headers = make_user()
+    many_id, many_headers = make_user()
+    _enroll(app, one_id, course_ids[:1])
+    _enroll(app, many_id, course_ids)
+
+    url = MY_ENROLLMENTS + (f"?fields={fields}" if fields else "")
+    # The first authenticated request loads the token revocation list
+    client.get(url, headers=one_headers)
+
+    response, one = count_statements(client.get, url, headers=one_headers)
+    assert response.status_code == 200
+    assert len(response.get_json()) == 1
+
+    response, many = count_statements(client.get, url, headers=many_headers)
+    assert response.status_code == 200
+    enrollments = response.get_json()
+    assert len(enrollments) == 25
+    if fields is None or "course" in fields:
+        assert all(enrollment["course"]["title"] for enrollment in enrollments)
+    assert many == one
+
+
+def test_concurrent_enrollments_never_exceed_capacity(app, make_user, make_courses):
+    instructor_id, _ = make_user("teacher")
+    (course_id,) = make_courses(instructor_id, 1, capacity=3)
+    students = [make_user() for _ in range(20)]
+
+    start = threading.Barrier(len(students))
+    statuses = []
+
+    def enroll(headers):
+        client = app.test_client()
+        start.wait()
+        response = client.post(
+            "/enrollments", json={"course_id": course_id}, headers=headers
+        )
+        statuses.append(response.status_code)
+
+    threads = [
+        threading.Thread(target=enroll, args=(headers,)) for _, headers in students
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(statuses) == [201] * 3 + [202] * 17
+    with app.app_context():
+        course = db.session.get(Course, course_id)
+        enrolled = db.session.execute(
+            db.select(db.func.count(Enrollment.id)).where(
+                Enrollment.course_id == course_id, Enrollment.status == "enrolled"
+            )
+        ).scalar_one()
+        assert course.enrolled_count == enrolled == 3
+
+
+def test_bulk_enroll_publishes_seat_counts(app, client, make_user, make_courses):
+    instructor_id, _ = make_user("teacher")
+    _, admin = make_user("admin")
+    first, second = make_courses(instructor_id, 2, capacity=3)
+    alice, bob = make_user()[0], make_user()[0]
+    rows = [(alice, first), (bob, first), (alice, second)]
+    body = "student_id,course_id\n" + "".join(f"{s},{c}\n" for s, c in rows)
+
+    response = client.post("/enrollments/bulk?format=csv", data=body, headers=admin)
+    assert response.status_code == 200
+    assert response.get_json()["enrolled"] == 3
+
+    messages = "".join(app.extensions["seat_events"]._log.since(0))
+    seats = {
+        event["course_id"]: event["enrolled_count"]
+        for event in (
+            json.loads(line[len("data: ") :])
+            for line in messages.splitlines()
+            if line.startswith("data: ")
+        )
+    }
+    assert seats == {first: 2, second: 1}
@@ -0,0 +1,50 @@
+from events import EventLog, RelayPublisher
+
+
+def test_event_log_resyncs_clients_ahead_of_it():
+    log = EventLog(backlog=10)
+    for course_id in range(3):
+        log.append("seats", {"course_id": course_id})
+
+    assert len(log.since(1)) == 2
+    assert log.since(3) == []
+    # An id from another worker or from before a restart cannot be replayed
+    assert log.since(500) is None
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    def sendall(self, data):
+        self.sent.append(data)
+
+    def close(self):
+        pass
+
+
+def test_relay_publisher_backs_off_while_relay_is_down(app, monkeypatch):
+    publisher = RelayPublisher(("127.0.0.1", 9), b"key")
+    attempts = []
+
+    def refuse():
+        attempts.append(1)
+        raise ConnectionRefusedError()
+
+    monkeypatch.setattr(publisher, "_connect", refuse)
+    with app.app_context():
+        for course_id in range(10):
+            publisher.publish("seats", {"course_id": course_id})
+
+    assert len(attempts) == 1
+    assert publisher.stats()["errors"] == 1
+    assert publisher.stats()["dropped"] == 9
+
+    # Once the retry interval has passed, the next event reconnects
+    sock = FakeSocket()
+    monkeypatch.setattr(publisher, "_connect", lambda: sock)
+    publisher._retry_at = 0.0
+    with app.app_context():
+        publisher.publish("seats", {"course_id": 1})
+    assert publisher.stats()["published"] == 1
+    assert len(sock.sent) == 1
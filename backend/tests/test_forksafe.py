@@ -0,0 +1,31 @@
+import os
+import pytest
+from forksafe import PerProcessWorker
+
+
+class Worker(PerProcessWorker):
+    def _start_worker(self):
+        return object()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_starts_its_own_worker():
+    owner = Worker()
+    parent_worker = owner._ensure_worker()
+    assert owner._ensure_worker() is parent_worker
+
+    pid = os.fork()
+    if pid == 0:
+        fresh = owner._ensure_worker() is not parent_worker
+        stable = owner._ensure_worker() is owner._ensure_worker()
+        os._exit(0 if fresh and stable else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert owner._ensure_worker() is parent_worker
+
+
+def test_detached_worker_is_restarted():
+    owner = Worker()
+    first = owner._ensure_worker()
+    assert owner._detach_worker() is first
+    assert owner._ensure_worker() is not first
@@ -0,0 +1,29 @@
+from sqlalchemy import create_engine, inspect
+from migrations import check_schema, create_base_tables, upgrade
+
+
+def test_base_tables_are_the_baseline_schema(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/fresh.db")
+    with engine.begin() as connection:
+        create_base_tables(connection)
+        inspector = inspect(connection)
+        assert set(inspector.get_table_names()) == {
+            "users",
+            "courses",
+            "enrollments",
+            "audit_log",
+        }
+        columns = {column["name"] for column in inspector.get_columns("courses")}
+        # Added by migration 2, not by the current models
+        assert "enrolled_count" not in columns
+        assert inspector.get_indexes("courses") == []
+    engine.dispose()
+
+
+def test_fresh_database_upgrades_to_the_models(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/fresh.db")
+    applied = upgrade(engine)
+    assert [version for version, _ in applied] == [1, 2, 3, 4, 5, 6]
+    assert check_schema(engine) == []
+    assert upgrade(engine) == []
+    engine.dispose()
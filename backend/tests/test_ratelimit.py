@@ -0,0 +1,41 @@
+import pytest
+from app import create_app
+from config import TestingConfig
+
+LOGIN = "/auth/login"
+
+
+@pytest.fixture
+def limited_app(app, monkeypatch):
+    """A second app on the same database with rate limits on, behind one proxy"""
+    monkeypatch.setattr(TestingConfig, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(TestingConfig, "PROXY_FIX_X_FOR", 1)
+    monkeypatch.setattr(
+        TestingConfig, "RATE_LIMITS", {"auth.login": (("ip", 0.001, 2),)}, raising=False
+    )
+    limited = create_app("testing")
+    yield limited
+    limited.extensions["audit"].close()
+    limited.extensions["token_revocation"].close()
+
+
+def _login(client, forwarded_for):
+    return client.post(
+        LOGIN,
+        json={"username": "nobody", "password": "wrong"},
+        headers={"X-Forwarded-For": forwarded_for},
+    )
+
+
+def test_ip_limits_key_on_forwarded_client_address(limited_app):
+    client = limited_app.test_client()
+
+    assert [_login(client, "203.0.113.1").status_code for _ in range(3)] == [
+        401,
+        401,
+        429,
+    ]
+    response = _login(client, "203.0.113.1")
+    assert response.headers["Retry-After"]
+    # Another client behind the same proxy has its own bucket
+    assert _login(client, "203.0.113.2").status_code == 401
@@ -0,0 +1,43 @@
+import base64
+import io
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+def test_update_profile_rejects_invalid_picture(client, make_user):
+    user_id, headers = make_user()
+
+    response = client.put(
+        f"/users/profile/{user_id}",
+        json={"profile_picture_url": "data:image/png;base64,not base64!"},
+        headers=headers,
+    )
+    assert response.status_code == 400
+
+
+def test_update_profile_rejects_oversized_picture(app, client, make_user):
+    user_id, headers = make_user()
+    app.config["PROFILE_PICTURE_MAX_BYTES"] = 32
+    picture = "data:image/png;base64," + base64.b64encode(PNG).decode()
+
+    response = client.put(
+        f"/users/profile/{user_id}",
+        json={"profile_picture_url": picture, "bio": "unchanged on error"},
+        headers=headers,
+    )
+    assert response.status_code == 413
+    profile = client.get(f"/users/profile/{user_id}", headers=headers).get_json()
+    assert profile["bio"] is None
+
+
+def test_upload_profile_picture_multipart(client, make_user):
+    user_id, headers = make_user()
+
+    response = client.post(
+        f"/users/profile/{user_id}/picture",
+        data={"picture": (io.BytesIO(PNG), "avatar.png", "image/png")},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    picture_url = response.get_json()["picture_url"]
+    assert client.get(picture_url).data == PNG
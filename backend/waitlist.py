@@ -0,0 +1,81 @@
+"""Course waitlists.
+
+A request to join a full course is stored as a "pending" enrollment. The
+queue order is the enrollment id, so a student's position is a count over
+the (course_id, status) index. Whenever seats open up, promote_waitlist()
+moves the head of the queue into them inside the caller's transaction.
+"""
+
+from datetime import datetime
+from models import db, Course, Enrollment
+
+PENDING = "pending"
+ENROLLED = "enrolled"
+
+
+def waitlist_position(enrollment):
+    """1-based position of a pending enrollment in its course's queue"""
+    ahead = db.session.execute(
+        db.select(db.func.count(Enrollment.id)).where(
+            Enrollment.course_id == enrollment.course_id,
+            Enrollment.status == PENDING,
+            Enrollment.id < enrollment.id,
+        )
+    ).scalar_one()
+    return ahead + 1
+
+
+def promote_waitlist(course_id):
+    """Enroll waitlisted students into the course's free seats.
+
+    Runs in the current transaction, so promotions commit (or roll back)
+    with the change that freed the seats. Returns the promoted
+    (enrollment_id, student_id) rows, in queue order.
+    """
+    promoted = []
+    while True:
+        free = db.session.execute(
+            db.select(Course.capacity - Course.enrolled_count).where(
+                Course.id == course_id
+            )
+        ).scalar()
+        if not free or free <= 0:
+            return promoted
+
+        heads = db.session.execute(
+            db.select(Enrollment.id, Enrollment.student_id)
+            .where(Enrollment.course_id == course_id, Enrollment.status == PENDING)
+            .order_by(Enrollment.id)
+            .limit(free)
+        ).all()
+        if not heads:
+            return promoted
+
+        for head in heads:
+            # The same conditional UPDATE as a direct enrollment, so a seat
+            # taken by a concurrent request is never handed out twice
+            reserved = db.session.execute(
+                db.update(Course)
+                .where(Course.id == course_id, Course.enrolled_count < Course.capacity)
+                .values(enrolled_count=Course.enrolled_count + 1)
+            ).rowcount
+            if not reserved:
+                return promoted
+
+            updated = db.session.execute(
+                db.update(Enrollment)
+                .where(Enrollment.id == head.id, Enrollment.status == PENDING)
+                .values(status=ENROLLED, updated_at=datetime.utcnow())
+            ).rowcount
+            if not updated:
+                # The student left the queue meanwhile; give the seat back
+                db.session.execute(
+                    db.update(Course)
+                    .where(Course.id == course_id)
+                    .values(enrolled_count=Course.enrolled_count - 1)
+                )
+                continue
+            promoted.append(head)
+
+        if len(heads) < free:
+            return promoted
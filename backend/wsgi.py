@@ -0,0 +1,18 @@
+"""WSGI entry point for production servers.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py preloads this module in the master process, so workers
+fork with the imports done, the app built and the ORM configured. Apply
+migrations (`flask db-upgrade`) before starting the server; nothing is
+migrated or seeded at startup in the production config.
+"""
+
+import os
+from sqlalchemy.orm import configure_mappers
+from app import create_app
+
+app = create_app(os.getenv("FLASK_CONFIG", "production"))
+
+# Otherwise every worker configures the mappers on its first query
+configure_mappers()
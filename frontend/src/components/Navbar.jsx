@@ -2,6 +2,7 @@
 import React, { useState, useEffect } from 'react';
 import { Link, useNavigate, useLocation } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
+import { resolveMediaUrl } from '../utils/media';
 import { motion, AnimatePresence } from 'framer-motion';
 import { Menu, X, User as UserIcon, LogOut, LayoutDashboard, BookOpen, Shield, Settings } from 'lucide-react';
 
@@ -92,7 +93,7 @@ export const Navbar = () => {
                   <div className="w-10 h-10 rounded-full bg-gradient-to-br from-primary to-primary-light p-0.5 shadow-md">
                     {user?.profile_picture_url ? (
                       <img
-                        src={user.profile_picture_url}
+                        src={resolveMediaUrl(user.profile_picture_url)}
                         alt={user?.username}
                         className="w-full h-full rounded-full object-cover border-2 border-white"
                       />
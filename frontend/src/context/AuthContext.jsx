@@ -14,6 +14,46 @@ export const AuthProvider = ({ children }) => {
   // Setup axios default with credentials to send cookies
   axios.defaults.withCredentials = true;
 
+  // Renew an expired session with the refresh cookie and retry the request
+  // once. Refresh tokens are single-use, so concurrent 401s share one refresh.
+  useEffect(() => {
+    const skipped = ['/auth/login', '/auth/register', '/auth/logout', '/auth/refresh'];
+    let refreshing = null;
+
+    const interceptor = axios.interceptors.response.use(
+      (response) => response,
+      async (error) => {
+        const original = error.config;
+        if (
+          error.response?.status !== 401 ||
+          !original ||
+          original._retried ||
+          skipped.some((path) => original.url?.includes(path))
+        ) {
+          return Promise.reject(error);
+        }
+
+        original._retried = true;
+        if (!refreshing) {
+          refreshing = axios
+            .post(`${API_BASE_URL}/auth/refresh`)
+            .finally(() => {
+              refreshing = null;
+            });
+        }
+        try {
+          await refreshing;
+        } catch (refreshError) {
+          setUser(null);
+          return Promise.reject(error);
+        }
+        return axios(original);
+      }
+    );
+
+    return () => axios.interceptors.response.eject(interceptor);
+  }, []);
+
   // Check if user is already logged in on app startup
   useEffect(() => {
     const checkAuth = async () => {
@@ -13,6 +13,7 @@ export const Courses = () => {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [searchTerm, setSearchTerm] = useState('');
+  const [searchResults, setSearchResults] = useState(null);
   const [enrollingCourse, setEnrollingCourse] = useState(null);
 
   const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000';
@@ -37,13 +38,84 @@ export const Courses = () => {
     fetchCourses();
   }, [isAuthenticated, navigate]);
 
+  // Debounced server-side search; an empty box shows the full catalogue
+  useEffect(() => {
+    const query = searchTerm.trim();
+    if (!query) {
+      setSearchResults(null);
+      return;
+    }
+
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const response = await axios.get(`${API_BASE_URL}/courses/search`, {
+          params: { q: query, limit: 50 }
+        });
+        if (!cancelled) setSearchResults(response.data);
+      } catch (err) {
+        if (!cancelled) setSearchResults([]);
+      }
+    }, 250);
+
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchTerm]);
+
+  // Live seat counts pushed by the server (Server-Sent Events)
+  useEffect(() => {
+    if (!isAuthenticated) return;
+
+    const streamUrl =
+      import.meta.env.VITE_SEATS_STREAM_URL || `${API_BASE_URL}/courses/seats/stream`;
+    const source = new EventSource(streamUrl);
+
+    const updateSeats = (list, seats) =>
+      list &&
+      list.map((course) =>
+        course.id === seats.course_id
+          ? { ...course, enrolled_count: seats.enrolled_count, capacity: seats.capacity }
+          : course
+      );
+    const removeCourse = (list, courseId) =>
+      list && list.filter((course) => course.id !== courseId);
+
+    source.addEventListener('seats', (event) => {
+      const seats = JSON.parse(event.data);
+      setCourses((list) => updateSeats(list, seats));
+      setSearchResults((list) => updateSeats(list, seats));
+    });
+    source.addEventListener('course_deleted', (event) => {
+      const { course_id } = JSON.parse(event.data);
+      setCourses((list) => removeCourse(list, course_id));
+      setSearchResults((list) => removeCourse(list, course_id));
+    });
+    // Sent when this client missed too many events to replay
+    source.addEventListener('resync', async () => {
+      try {
+        const response = await axios.get(`${API_BASE_URL}/courses`);
+        setCourses(response.data);
+      } catch (err) {
+        // Keep the current list; the next event or reload will correct it
+      }
+    });
+
+    return () => source.close();
+  }, [isAuthenticated]);
+
   const handleEnroll = async (courseId) => {
     try {
       setEnrollingCourse(courseId);
-      await axios.post(
+      const response = await axios.post(
         `${API_BASE_URL}/enrollments`,
         { course_id: courseId }
       );
+      if (response.status === 202) {
+        // Course is full: the seat is assigned automatically when one frees up
+        alert(`This course is full. You are #${response.data.position} on the waitlist.`);
+      }
       // Wait a bit to show success state
       setTimeout(() => navigate('/dashboard'), 500);
     } catch (err) {
@@ -53,9 +125,7 @@ export const Courses = () => {
     }
   };
 
-  const filteredCourses = courses.filter((course) =>
-    course.title.toLowerCase().includes(searchTerm.toLowerCase())
-  );
+  const filteredCourses = searchResults ?? courses;
 
   const containerVariants = {
     hidden: { opacity: 0 },
@@ -3,6 +3,7 @@ import React, { useState, useEffect } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import axios from 'axios';
 import { useAuth } from '../context/AuthContext';
+import { resolveMediaUrl } from '../utils/media';
 import { motion, AnimatePresence } from 'framer-motion';
 import { User, Mail, Phone, MapPin, Globe, CreditCard, Camera, Edit2, Check, X, Loader, AlertCircle } from 'lucide-react';
 
@@ -18,6 +19,7 @@ export function Profile() {
   const [success, setSuccess] = useState('');
   const [isEditing, setIsEditing] = useState(false);
   const [previewImage, setPreviewImage] = useState(null);
+  const [pictureFile, setPictureFile] = useState(null);
 
   const [formData, setFormData] = useState({
     full_name: '',
@@ -59,7 +61,7 @@ export function Profile() {
         country: response.data.country || '',
         role: response.data.role || ''
       });
-      setPreviewImage(response.data.profile_picture_url);
+      setPreviewImage(resolveMediaUrl(response.data.profile_picture_url));
       setError('');
     } catch (err) {
       console.error('Error fetching profile:', err);
@@ -78,19 +80,18 @@ export function Profile() {
     }));
   };
 
+  // Local previews are object URLs; release each one when it is replaced
+  useEffect(() => {
+    if (!previewImage || !previewImage.startsWith('blob:')) return;
+    return () => URL.revokeObjectURL(previewImage);
+  }, [previewImage]);
+
   const handleImageUpload = (e) => {
     const file = e.target.files[0];
     if (file) {
-      const reader = new FileReader();
-      reader.onload = (event) => {
-        const base64String = event.target.result;
-        setPreviewImage(base64String);
-        setFormData(prev => ({
-          ...prev,
-          profile_picture_url: base64String
-        }));
-      };
-      reader.readAsDataURL(file);
+      // Uploaded as-is with the form; no base64 copy in memory or on the wire
+      setPictureFile(file);
+      setPreviewImage(URL.createObjectURL(file));
     }
   };
 
@@ -110,12 +111,15 @@ export function Profile() {
         country: formData.country
       };
 
-      if (formData.profile_picture_url && formData.profile_picture_url.startsWith('data:')) {
+      if (pictureFile) {
+        const upload = new FormData();
+        upload.append('picture', pictureFile);
         try {
           await axios.post(
             `${API_BASE_URL}/users/profile/${authUser.id}/picture`,
-            { picture_base64: formData.profile_picture_url }
+            upload
           );
+          setPictureFile(null);
         } catch (picErr) {
           console.warn('Picture upload failed:', picErr);
         }
@@ -418,7 +422,8 @@ export function Profile() {
                         type="button"
                         onClick={() => {
                           setIsEditing(false);
-                          setPreviewImage(profile.profile_picture_url); // Revert image preview
+                          setPictureFile(null);
+                          setPreviewImage(resolveMediaUrl(profile.profile_picture_url)); // Revert image preview
                         }}
                         className="flex-1 bg-white/5 hover:bg-white/10 text-white py-3 rounded-xl transition-all font-bold border border-white/10"
                         disabled={loading}
@@ -0,0 +1,4 @@
+const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000';
+
+// Profile pictures are stored as API-relative references such as /media/<digest>
+export const resolveMediaUrl = (url) => (url && url.startsWith('/') ? `${API_BASE_URL}${url}` : url);
@@ -13,5 +13,9 @@ if (-Not (Test-Path $venvPath)) {
 # Change to backend directory
 Set-Location .\backend
 
+# Apply migrations and load demo data into an empty database
+flask --app app db-upgrade
+flask --app app seed
+
 # Run Flask app
 python app.py
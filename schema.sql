@@ -33,6 +33,7 @@ CREATE TABLE IF NOT EXISTS courses (
     instructor_id INT NOT NULL,
     credits INT NOT NULL DEFAULT 3,
     capacity INT NOT NULL DEFAULT 30,
+    enrolled_count INT NOT NULL DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (instructor_id) REFERENCES users(id) ON DELETE CASCADE,
@@ -47,11 +48,11 @@ CREATE TABLE IF NOT EXISTS enrollments (
     status ENUM('pending', 'enrolled') NOT NULL DEFAULT 'pending',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    -- unique_enrollment also serves student_id lookups
     UNIQUE KEY unique_enrollment (student_id, course_id),
     FOREIGN KEY (student_id) REFERENCES users(id) ON DELETE CASCADE,
     FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE,
-    INDEX idx_student (student_id),
-    INDEX idx_course (course_id),
+    INDEX idx_course_status (course_id, status),
     INDEX idx_status (status)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
@@ -66,6 +67,18 @@ CREATE TABLE IF NOT EXISTS audit_log (
     INDEX idx_timestamp (timestamp)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Revoked JWTs, pruned once they expire
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    jti VARCHAR(36) NOT NULL UNIQUE,
+    user_id INT,
+    expires_at TIMESTAMP NOT NULL,
+    revoked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    INDEX idx_revoked_expires (expires_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- Create indexes for performance
+-- Keep in sync with the Index declarations in backend/models.py
 CREATE INDEX idx_courses_title ON courses(title);
 CREATE INDEX idx_enrollments_created ON enrollments(created_at);
@@ -11,7 +11,7 @@ Write-Host "Starting Campus Hub Application..." -ForegroundColor Green
 Write-Host "`nStarting Backend (Flask) on port 5000..." -ForegroundColor Cyan
 
 # Start backend in a new PowerShell window
-Start-Process powershell -ArgumentList "-NoExit", "-Command", "cd '$PWD\'; & '$venvPath'; cd backend; python app.py"
+Start-Process powershell -ArgumentList "-NoExit", "-Command", "cd '$PWD\'; & '$venvPath'; cd backend; flask --app app db-upgrade; flask --app app seed; python app.py"
 
 Write-Host "Backend started. Waiting 3 seconds..." -ForegroundColor Yellow
 Start-Sleep -Seconds 3